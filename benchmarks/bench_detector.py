@@ -0,0 +1,56 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+"""Сравнение однопроходного детектора подписей с прежним циклом по шаблонам.
+
+Запуск: python -m benchmarks.bench_detector
+"""
+
+import re
+import timeit
+
+from domain.detector import inline_detector
+
+LEGACY_PATTERNS = [
+    r"[Vv]ia\s+(@\w+[Bb]ot\b)",
+    r"[Cc]\s+помощью\s+(@\w+[Bb]ot\b)",
+    r"[Чч]ерез\s+(@\w+[Bb]ot\b)",
+    r"[Ww]ith\s+(@\w+[Bb]ot\b)",
+    r"[Bb]y\s+(@\w+[Bb]ot\b)",
+]
+
+
+def legacy_detect(text: str):
+    patterns = list(LEGACY_PATTERNS)
+    for pattern in patterns:
+        match = re.search(pattern, text)
+        if match:
+            return match.group(1)
+    return None
+
+
+FILLER = "Подпись к фотографии с длинным описанием события и хэштегами #tag "
+
+CASES = {
+    "no_signature": FILLER * 60,
+    "signature_at_end": FILLER * 60 + "by @SomeInlineBot",
+    "many_mentions": (FILLER + "@friend_bot ") * 60,
+    "signature_at_start": "via @SomeInlineBot " + FILLER * 60,
+}
+
+
+def main(number: int = 2000):
+    for name, text in CASES.items():
+        assert legacy_detect(text) == inline_detector.detect(text)
+        legacy = timeit.timeit(lambda: legacy_detect(text), number=number)
+        current = timeit.timeit(lambda: inline_detector.detect(text), number=number)
+        print(
+            f"{name:<20} len={len(text):<6} "
+            f"legacy={legacy / number * 1e6:8.2f}us "
+            f"detector={current / number * 1e6:8.2f}us "
+            f"speedup={legacy / current:5.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
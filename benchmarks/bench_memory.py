@@ -0,0 +1,117 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+"""Память на настройки чатов: отдельный ChatConfig на каждый чат против общего дефолта.
+
+Запуск: python -m benchmarks.bench_memory [--chats 100000]
+"""
+
+import argparse
+import asyncio
+import gc
+import tracemalloc
+from dataclasses import dataclass, field
+from typing import Dict, Optional
+
+from core.config import SETTINGS_CACHE_MAX_CHATS
+from core.database import Database
+from core.storage import ChatSettingsStore, SQLiteSettingsBackend
+from domain.models import ChatConfig, DeleteMode
+
+
+@dataclass
+class LegacyTimeRange:
+    start_hour: int = 22
+    start_minute: int = 0
+    end_hour: int = 8
+    end_minute: int = 0
+    mode: DeleteMode = DeleteMode.ALWAYS
+
+
+@dataclass
+class LegacyAutoDeleteSettings:
+    enabled: bool = True
+    delete_after: int = 30
+
+
+@dataclass
+class LegacyChatConfig:
+    whitelist: list = field(default_factory=lambda: ["@gif", "@vid", "@music"])
+    time_range: LegacyTimeRange = field(default_factory=LegacyTimeRange)
+    auto_delete: LegacyAutoDeleteSettings = field(
+        default_factory=LegacyAutoDeleteSettings
+    )
+    last_bot_message_id: Optional[int] = None
+    message_tasks: Dict[int, asyncio.Task] = field(default_factory=dict)
+
+
+def _legacy(chats: int):
+    return {chat_id: LegacyChatConfig() for chat_id in range(chats)}
+
+
+def _eager(chats: int):
+    return {chat_id: ChatConfig() for chat_id in range(chats)}
+
+
+def _shared_default(chats: int, max_cached: int = 0):
+    store = ChatSettingsStore(
+        SQLiteSettingsBackend(Database(":memory:")), 5, max_cached or chats
+    )
+    store.backend.load = lambda chat_id: None
+    for chat_id in range(chats):
+        store.get_config(chat_id)
+    return store
+
+
+def _customized(chats: int, share: float, max_cached: int = 0):
+    store = ChatSettingsStore(
+        SQLiteSettingsBackend(Database(":memory:")), 5, max_cached or chats
+    )
+    for chat_id in range(chats):
+        if chat_id < chats * share:
+            store.edit(chat_id).time_range.mode = DeleteMode.DISABLED
+            store.mark_dirty(chat_id)
+        else:
+            store.get_config(chat_id)
+    asyncio.run(store.flush())
+    return store
+
+
+def measure(build, *args) -> int:
+    gc.collect()
+    tracemalloc.start()
+    result = build(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return size
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--chats", type=int, default=100_000)
+    args = parser.parse_args()
+
+    cases = [
+        ("legacy dataclass per chat", _legacy, args.chats),
+        ("slotted ChatConfig per chat", _eager, args.chats),
+        ("shared default", _shared_default, args.chats),
+        ("shared default, 10% customized", _customized, args.chats, 0.1),
+        (
+            "10% customized, LRU 20000",
+            _customized,
+            args.chats,
+            0.1,
+            SETTINGS_CACHE_MAX_CHATS,
+        ),
+    ]
+
+    print(f"{'layout':<32}{'total MB':>10}{'bytes/chat':>12}")
+    print("-" * 54)
+    for name, build, *build_args in cases:
+        size = measure(build, *build_args)
+        print(f"{name:<32}{size / 1048576:>10.1f}{size / args.chats:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
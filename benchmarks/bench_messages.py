@@ -0,0 +1,167 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+"""Бенчмарк горячего пути обработки сообщений (handle_all_messages).
+
+Прогоняет синтетические сообщения разных типов через обработчик с
+офлайн-сессией Bot API и выводит сообщения в секунду, задержки p50/p99,
+число вызовов API на сообщение и объём выделенной памяти.
+
+Запуск:
+    python -m benchmarks.bench_messages
+    python -m benchmarks.bench_messages --json current.json --compare baseline.json
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+from aiogram.types import Message
+
+import core.storage
+from benchmarks.stub_bot import create_stub_bot
+
+ADMIN_ID = 1
+MEMBER_ID = 2
+
+
+def _message(index: int, chat_id: int, sender_id: int, **extra) -> Message:
+    data = {
+        "message_id": index,
+        "date": 0,
+        "chat": {"id": chat_id, "type": "supergroup"},
+        "from": {"id": sender_id, "is_bot": False, "first_name": "user"},
+    }
+    data.update(extra)
+    return Message.model_validate(data)
+
+
+def _via(username: str) -> dict:
+    return {"id": 777, "is_bot": True, "first_name": "bot", "username": username}
+
+
+KEYBOARD = {"inline_keyboard": [[{"text": "open", "url": "https://example.com"}]]}
+CAPTION = "Очень длинная подпись к картинке с описанием и хэштегами #tag " * 15
+
+SCENARIOS: Dict[str, Callable[[int, int], Message]] = {
+    "plain_text": lambda i, chat: _message(
+        i, chat, MEMBER_ID, text="обычное сообщение в чате"
+    ),
+    "via_bot": lambda i, chat: _message(
+        i, chat, MEMBER_ID, text="result", via_bot=_via("SpamInlineBot")
+    ),
+    "caption_keyboard": lambda i, chat: _message(
+        i,
+        chat,
+        MEMBER_ID,
+        caption=CAPTION + "via @SpamInlineBot",
+        photo=[{"file_id": "x", "file_unique_id": "x", "width": 1, "height": 1}],
+        reply_markup=KEYBOARD,
+    ),
+    "whitelisted_bot": lambda i, chat: _message(
+        i, chat, MEMBER_ID, text="gif", via_bot=_via("gif")
+    ),
+    "admin_sender": lambda i, chat: _message(
+        i, chat, ADMIN_ID, text="result", via_bot=_via("SpamInlineBot")
+    ),
+}
+
+
+def _percentile(values: List[float], percent: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(percent / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+async def run_scenario(name: str, count: int, chats: int) -> Dict[str, float]:
+    from handlers.messages import handle_all_messages
+    from utils.batch_delete import batch_deleter
+
+    bot = create_stub_bot(admin_ids=(ADMIN_ID,))
+    factory = SCENARIOS[name]
+    messages = [factory(i, -1000000000000 - i % chats) for i in range(count)]
+
+    for message in messages[:chats]:
+        await handle_all_messages(message, bot)
+    await batch_deleter.flush_all()
+    bot.session.reset()
+
+    latencies = []
+    started = time.perf_counter()
+    for message in messages:
+        begin = time.perf_counter()
+        await handle_all_messages(message, bot)
+        latencies.append(time.perf_counter() - begin)
+    await batch_deleter.flush_all()
+    elapsed = time.perf_counter() - started
+    calls = bot.session.reset()
+
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    for message in messages[: min(count, 1000)]:
+        await handle_all_messages(message, bot)
+    await batch_deleter.flush_all()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "messages_per_second": count / elapsed,
+        "p50_us": _percentile(latencies, 50) * 1e6,
+        "p99_us": _percentile(latencies, 99) * 1e6,
+        "api_calls_per_message": sum(calls.values()) / count,
+        "alloc_peak_kb": (peak - before) / 1024,
+        "calls": calls,
+    }
+
+
+async def run(count: int, chats: int, scenarios: List[str]) -> Dict[str, dict]:
+    return {name: await run_scenario(name, count, chats) for name in scenarios}
+
+
+def print_report(results: Dict[str, dict], baseline: Dict[str, dict] = None):
+    header = f"{'scenario':<18}{'msg/s':>12}{'p50 us':>10}{'p99 us':>10}{'api/msg':>10}{'peak KB':>10}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        line = (
+            f"{name:<18}{result['messages_per_second']:>12.0f}"
+            f"{result['p50_us']:>10.1f}{result['p99_us']:>10.1f}"
+            f"{result['api_calls_per_message']:>10.3f}{result['alloc_peak_kb']:>10.1f}"
+        )
+        if baseline and name in baseline:
+            previous = baseline[name]["messages_per_second"]
+            change = (result["messages_per_second"] / previous - 1) * 100
+            line += f"   {change:+.1f}% vs baseline"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--messages", type=int, default=5000)
+    parser.add_argument("--chats", type=int, default=50)
+    parser.add_argument("--scenario", action="append", choices=list(SCENARIOS))
+    parser.add_argument("--json", help="сохранить результаты в файл")
+    parser.add_argument("--compare", help="сравнить с сохранёнными результатами")
+    args = parser.parse_args()
+
+    core.storage.database.path = ":memory:"
+    results = asyncio.run(
+        run(args.messages, args.chats, args.scenario or list(SCENARIOS))
+    )
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            baseline = json.load(file)
+    print_report(results, baseline)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
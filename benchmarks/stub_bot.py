@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+"""Офлайн-сессия Bot API для бенчмарков: отвечает заглушками и считает вызовы."""
+
+import time
+from collections import Counter
+from typing import Any, AsyncGenerator, Dict, Optional
+
+from aiogram import Bot
+from aiogram.client.session.base import BaseSession
+from aiogram.methods import (
+    DeleteMessage,
+    DeleteMessages,
+    EditMessageText,
+    GetChatAdministrators,
+    GetChatMember,
+    SendMessage,
+)
+from aiogram.methods.base import TelegramMethod, TelegramType
+from aiogram.types import (
+    Chat,
+    ChatMemberMember,
+    ChatMemberOwner,
+    Message,
+    User,
+)
+
+STUB_TOKEN = "123456:benchmark"
+BOT_USER = User(id=123456, is_bot=True, first_name="cleaner")
+
+
+class StubSession(BaseSession):
+    def __init__(self, admin_ids=(1,), **kwargs: Any):
+        super().__init__(**kwargs)
+        self.admin_ids = set(admin_ids)
+        self.calls: Counter = Counter()
+        self._next_message_id = 1_000_000
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        self.calls[method.__api_method__] += 1
+
+        if isinstance(method, (DeleteMessage, DeleteMessages)):
+            return True
+        if isinstance(method, GetChatAdministrators):
+            return [self._admin(user_id) for user_id in sorted(self.admin_ids)]
+        if isinstance(method, GetChatMember):
+            if method.user_id in self.admin_ids:
+                return self._admin(method.user_id)
+            return ChatMemberMember(user=self._user(method.user_id))
+        if isinstance(method, (SendMessage, EditMessageText)):
+            self._next_message_id += 1
+            return Message(
+                message_id=self._next_message_id,
+                date=int(time.time()),
+                chat=Chat(id=method.chat_id, type="supergroup"),
+                from_user=BOT_USER,
+                text=method.text,
+            )
+        return True
+
+    async def stream_content(
+        self, *args: Any, **kwargs: Any
+    ) -> AsyncGenerator[bytes, None]:
+        yield b""
+
+    async def close(self) -> None:
+        pass
+
+    def reset(self) -> Dict[str, int]:
+        calls = dict(self.calls)
+        self.calls.clear()
+        return calls
+
+    @staticmethod
+    def _user(user_id: int) -> User:
+        return User(id=user_id, is_bot=False, first_name=f"user{user_id}")
+
+    def _admin(self, user_id: int) -> ChatMemberOwner:
+        return ChatMemberOwner(user=self._user(user_id), is_anonymous=False)
+
+
+def create_stub_bot(**kwargs: Any) -> Bot:
+    return Bot(token=STUB_TOKEN, session=StubSession(**kwargs))
@@ -2,18 +2,203 @@
 # Copyright (C) 2026 CodWiz
 
 import asyncio
-from aiogram import Bot
-from core.config import BOT_TOKEN, logger
+import hmac
+import signal
+from typing import Callable, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.client.telegram import TelegramAPIServer
+from aiogram.webhook.aiohttp_server import setup_application
+from aiohttp import web
+
+from core.config import (
+    ALLOWED_UPDATES,
+    API_BASE_URL,
+    BOT_TOKEN,
+    POLLING_TIMEOUT,
+    RATE_LIMIT_GLOBAL_PER_SECOND,
+    RUN_MODE,
+    WEBHOOK_HOST,
+    WEBHOOK_PORT,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+    WEBHOOK_URL,
+    logger,
+)
 from bot.dispatcher import setup_dispatcher
+from bot.middlewares import ApiMetricsMiddleware
+from bot.sharding import extract_chat_id
+from bot.updates import UpdateScheduler, update_chat_id, update_scheduler
+from core.metrics import registry
+from utils.ratelimit import RateLimitMiddleware
+
+
+def create_bot(rate_limit_share: float = 1.0) -> Bot:
+    """Создаёт экземпляр бота с ограничителем исходящих запросов"""
+    session = None
+    if API_BASE_URL:
+        session = AiohttpSession(api=TelegramAPIServer.from_base(API_BASE_URL))
+
+    bot = Bot(token=BOT_TOKEN, session=session)
+    rate_limiter = RateLimitMiddleware(
+        global_per_second=RATE_LIMIT_GLOBAL_PER_SECOND * rate_limit_share
+    )
+    bot.session.middleware(rate_limiter)
+    bot.session.middleware(ApiMetricsMiddleware())
+
+    registry.counter_callback(
+        "cleaner_bot_api_retry_after_total",
+        "Bot API calls deferred because of TelegramRetryAfter",
+        lambda: {(): rate_limiter.retry_after_count},
+    )
+    return bot
+
+
+def handle_stop_signals(callback: Callable[[], None]) -> Callable[[], None]:
+    """Вызывает callback по SIGTERM/SIGINT; возвращает функцию снятия обработчиков"""
+    loop = asyncio.get_running_loop()
+    installed = []
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, callback)
+        except (NotImplementedError, RuntimeError):
+            continue
+        installed.append(sig)
+
+    def remove():
+        for sig in installed:
+            loop.remove_signal_handler(sig)
+
+    return remove
+
+
+async def poll_updates(bot: Bot, scheduler: UpdateScheduler):
+    """Цикл getUpdates: обновления передаются планировщику, который задерживает приём при переполнении"""
+    offset = None
+    backoff = 1.0
+    while True:
+        try:
+            updates = await bot.get_updates(
+                offset=offset,
+                timeout=POLLING_TIMEOUT,
+                allowed_updates=ALLOWED_UPDATES,
+                request_timeout=int(bot.session.timeout + POLLING_TIMEOUT),
+            )
+        except Exception as e:
+            logger.error(f"Error fetching updates, retry in {backoff:.0f}s: {e}")
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, 30)
+            continue
+
+        backoff = 1.0
+        for update in updates:
+            offset = update.update_id + 1
+            await scheduler.submit(update_chat_id(update), update)
+
+
+async def run_polling(bot: Bot, dp: Dispatcher):
+    """Получение обновлений через long polling"""
+    await bot.delete_webhook()
+    update_scheduler.start(lambda update: dp.feed_update(bot, update))
+    await dp.emit_startup(bot=bot, dispatcher=dp)
+    logger.info("Бот запущен (polling)")
+
+    poll_task = asyncio.create_task(poll_updates(bot, update_scheduler))
+    remove_handlers = handle_stop_signals(poll_task.cancel)
+    try:
+        await poll_task
+    except asyncio.CancelledError:
+        logger.info("Получен сигнал остановки, завершаем работу")
+    finally:
+        remove_handlers()
+        await update_scheduler.join()
+        await dp.emit_shutdown(bot=bot, dispatcher=dp)
+        await bot.session.close()
 
 
-async def main():
+def create_webhook_app(bot: Bot, dp: Dispatcher) -> web.Application:
+    """Создаёт aiohttp-приложение, принимающее обновления по вебхуку"""
+    if not WEBHOOK_SECRET:
+        raise RuntimeError("Для режима webhook необходимо задать WEBHOOK_SECRET")
+
+    update_scheduler.start(lambda update: dp.feed_raw_update(bot, update))
+
+    async def handle_update(request: web.Request) -> web.Response:
+        secret = request.headers.get("X-Telegram-Bot-Api-Secret-Token")
+        if not hmac.compare_digest((secret or "").encode(), WEBHOOK_SECRET.encode()):
+            return web.Response(status=401, text="Unauthorized")
+        try:
+            update = await request.json()
+        except ValueError:
+            return web.Response(status=400, text="Bad Request")
+        await update_scheduler.submit(extract_chat_id(update), update)
+        return web.json_response({})
+
+    async def drain_updates(app: web.Application):
+        await update_scheduler.join()
+
+    app = web.Application()
+    app.router.add_post(WEBHOOK_PATH, handle_update)
+    app.on_shutdown.append(drain_updates)
+    setup_application(app, dp, bot=bot)
+    return app
+
+
+async def register_webhook(bot: Bot, dispatcher: Dispatcher):
+    """Регистрирует вебхук в Telegram, если задан публичный адрес"""
+    if not WEBHOOK_URL:
+        logger.warning("WEBHOOK_URL не задан, вебхук в Telegram не регистрируется")
+        return
+
+    await bot.set_webhook(
+        WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH,
+        secret_token=WEBHOOK_SECRET,
+        allowed_updates=ALLOWED_UPDATES,
+    )
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher):
+    """Приём обновлений через вебхук"""
+    dp.startup.register(register_webhook)
+    app = create_webhook_app(bot, dp)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT)
+    await site.start()
+
+    logger.info(
+        f"Бот запущен (webhook) на http://{WEBHOOK_HOST}:{WEBHOOK_PORT}{WEBHOOK_PATH}"
+    )
+    stop = asyncio.Event()
+    remove_handlers = handle_stop_signals(stop.set)
+    try:
+        await stop.wait()
+        logger.info("Получен сигнал остановки, завершаем работу")
+    finally:
+        remove_handlers()
+        await runner.cleanup()
+
+
+async def main(mode: Optional[str] = None):
     """Основная функция запуска бота"""
-    bot = Bot(token=BOT_TOKEN)
+    mode = mode or RUN_MODE
+    if mode == "sharded":
+        from bot.sharding import run_sharded
+
+        await run_sharded()
+        return
+
+    bot = create_bot()
     dp = setup_dispatcher()
 
-    logger.info("Бот запущен")
-    await dp.start_polling(bot)
+    if mode == "webhook":
+        await run_webhook(bot, dp)
+    elif mode == "polling":
+        await run_polling(bot, dp)
+    else:
+        raise ValueError(f"Неизвестный режим запуска: {mode}")
 
 
 if __name__ == "__main__":
@@ -2,19 +2,25 @@
 # Copyright (C) 2026 CodWiz
 
 from aiogram import Dispatcher
-from aiogram.fsm.storage.memory import MemoryStorage
 from aiogram.filters import StateFilter, Command
 
 from handlers.commands import cmd_start, cmd_settings
 from handlers.messages import handle_text_input, handle_all_messages
 from handlers.callbacks import handle_settings_callback
+from handlers.members import handle_chat_member, handle_my_chat_member
+from core.storage import chat_settings, database, fsm_storage
+from bot.middlewares import MessagePrecheckMiddleware, UpdateMetricsMiddleware
+from core.metrics import metrics_server
 from domain.states import SettingsState
+from utils.batch_delete import batch_deleter
+from utils.scheduler import auto_delete_scheduler
 
 
 def setup_dispatcher() -> Dispatcher:
     """Настройка диспетчера и регистрация всех обработчиков"""
-    storage = MemoryStorage()
-    dp = Dispatcher(storage=storage)
+    dp = Dispatcher(storage=fsm_storage)
+    dp.update.outer_middleware(UpdateMetricsMiddleware())
+    dp.message.outer_middleware(MessagePrecheckMiddleware())
 
     dp.message.register(cmd_start, Command("start"))
     dp.message.register(cmd_settings, Command("settings"))
@@ -24,4 +30,18 @@ def setup_dispatcher() -> Dispatcher:
 
     dp.callback_query.register(handle_settings_callback)
 
+    dp.chat_member.register(handle_chat_member)
+    dp.my_chat_member.register(handle_my_chat_member)
+
+    dp.startup.register(metrics_server.start)
+    dp.startup.register(chat_settings.start)
+    dp.startup.register(fsm_storage.start)
+    dp.startup.register(auto_delete_scheduler.start)
+    dp.shutdown.register(auto_delete_scheduler.stop)
+    dp.shutdown.register(batch_deleter.flush_all)
+    dp.shutdown.register(chat_settings.stop)
+    dp.shutdown.register(fsm_storage.stop)
+    dp.shutdown.register(database.close)
+    dp.shutdown.register(metrics_server.stop)
+
     return dp
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.dispatcher.event.bases import UNHANDLED
+from aiogram.methods.base import Response, TelegramMethod, TelegramType
+from aiogram.types import Message, TelegramObject, Update
+
+from core.metrics import api_latency, updates_dropped, updates_received
+from core.storage import chat_settings
+
+
+class UpdateMetricsMiddleware(BaseMiddleware):
+    """Подсчёт входящих обновлений по типам"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any],
+    ) -> Any:
+        if isinstance(event, Update):
+            updates_received.inc(type=event.event_type)
+        return await handler(event, data)
+
+
+class MessagePrecheckMiddleware(BaseMiddleware):
+    """Отсекает сообщения, которые заведомо не нужны ни одному обработчику"""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: Message,
+        data: Dict[str, Any],
+    ) -> Any:
+        reason = self.drop_reason(event, data)
+        if reason is None:
+            return await handler(event, data)
+
+        updates_dropped.inc(reason=reason)
+        return UNHANDLED
+
+    @staticmethod
+    def drop_reason(message: Message, data: Dict[str, Any]) -> Optional[str]:
+        if data.get("raw_state") is not None:
+            return None
+
+        text = message.text or message.caption
+        if text and text.startswith("/"):
+            return None
+
+        if message.chat.type == "private":
+            return "private"
+        if message.via_bot is None and message.reply_markup is None:
+            return "not_inline"
+        if not chat_settings.get_config(message.chat.id).time_range.is_active():
+            return "inactive"
+        return None
+
+
+class ApiMetricsMiddleware(BaseRequestMiddleware):
+    """Измерение задержки запросов к Bot API по методам"""
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        started = time.perf_counter()
+        outcome = "ok"
+        try:
+            return await make_request(bot, method)
+        except Exception as e:
+            outcome = type(e).__name__
+            raise
+        finally:
+            api_latency.observe(
+                time.perf_counter() - started,
+                method=method.__api_method__,
+                outcome=outcome,
+            )
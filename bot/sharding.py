@@ -0,0 +1,225 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import asyncio
+import hmac
+import multiprocessing
+import os
+import signal
+from queue import Empty, Full
+from typing import Callable, List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiohttp import web
+
+from core.config import (
+    ALLOWED_UPDATES,
+    SHARD_WORKERS,
+    UPDATE_QUEUE_LIMIT,
+    WEBHOOK_HOST,
+    WEBHOOK_PORT,
+    WEBHOOK_PATH,
+    WEBHOOK_SECRET,
+    WEBHOOK_URL,
+    logger,
+)
+
+UPDATE_CHAT_PATHS = (
+    ("message", "chat"),
+    ("edited_message", "chat"),
+    ("callback_query", "message", "chat"),
+    ("chat_member", "chat"),
+    ("my_chat_member", "chat"),
+)
+
+
+def extract_chat_id(update: dict) -> Optional[int]:
+    """Определяет чат, к которому относится сырое обновление"""
+    for path in UPDATE_CHAT_PATHS:
+        node = update
+        for key in path:
+            node = node.get(key) if isinstance(node, dict) else None
+            if node is None:
+                break
+        if node is not None:
+            return node.get("id")
+    return None
+
+
+def shard_for(chat_id: Optional[int], shards: int) -> int:
+    return chat_id % shards if chat_id is not None else 0
+
+
+async def worker_main(
+    shard_id: int,
+    queue: multiprocessing.Queue,
+    bot: Bot,
+    dp: Dispatcher,
+):
+    """Цикл воркера: обрабатывает обновления своего шарда, сохраняя порядок в чате"""
+    from bot.updates import update_scheduler
+
+    loop = asyncio.get_running_loop()
+    update_scheduler.start(lambda update: dp.feed_raw_update(bot, update))
+
+    await dp.emit_startup(bot=bot, dispatcher=dp)
+    logger.info(f"Шард {shard_id} запущен (pid {os.getpid()})")
+    try:
+        running = True
+        while running:
+            batch = [await loop.run_in_executor(None, queue.get)]
+            try:
+                while len(batch) < 1000:
+                    batch.append(queue.get_nowait())
+            except Empty:
+                pass
+
+            for update in batch:
+                if update is None:
+                    running = False
+                    break
+                await update_scheduler.submit(extract_chat_id(update), update)
+
+        await update_scheduler.join()
+    finally:
+        await dp.emit_shutdown(bot=bot, dispatcher=dp)
+        await bot.session.close()
+
+
+def run_worker(shard_id: int, queue: multiprocessing.Queue, shards: int):
+    """Точка входа процесса-воркера"""
+    from bot.bot import create_bot
+    from bot.dispatcher import setup_dispatcher
+    from core.metrics import metrics_server
+    from core.storage import fsm_storage, pending_deletions
+
+    # Остановкой управляет приёмник: он дописывает обновления в очереди и
+    # посылает воркерам None, иначе сигнал оборвал бы их без emit_shutdown
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+
+    if metrics_server.port:
+        metrics_server.port += shard_id + 1
+
+    # База общая для всех воркеров: восстанавливаем только сессии и удаления своих чатов
+    pending_deletions.shard = (shard_id, shards)
+    if fsm_storage.store is not None:
+        fsm_storage.store.shard = (shard_id, shards)
+
+    asyncio.run(
+        worker_main(
+            shard_id,
+            queue,
+            create_bot(rate_limit_share=1 / shards),
+            setup_dispatcher(),
+        )
+    )
+
+
+class ShardRouter:
+    """Распределяет обновления по процессам-воркерам по хэшу chat_id.
+
+    Очереди воркеров ограничены max_pending: если шард не успевает,
+    route() блокируется до освобождения места.
+    """
+
+    def __init__(
+        self,
+        shards: int,
+        target: Callable = run_worker,
+        args: tuple = (),
+        max_pending: int = UPDATE_QUEUE_LIMIT,
+    ):
+        context = multiprocessing.get_context("spawn")
+        self.shards = shards
+        self.routed = [0] * shards
+        self.queues: List[multiprocessing.Queue] = [
+            context.Queue(maxsize=max_pending) for _ in range(shards)
+        ]
+        self.processes = [
+            context.Process(
+                target=target,
+                args=(shard_id, queue, *args),
+                name=f"shard-{shard_id}",
+                daemon=True,
+            )
+            for shard_id, queue in enumerate(self.queues)
+        ]
+
+    def start(self):
+        for process in self.processes:
+            process.start()
+
+    def route(self, update: dict) -> int:
+        shard_id = shard_for(extract_chat_id(update), self.shards)
+        self.queues[shard_id].put(update)
+        self.routed[shard_id] += 1
+        return shard_id
+
+    def stop(self, timeout: float = 10):
+        for queue in self.queues:
+            try:
+                queue.put(None, timeout=timeout)
+            except Full:
+                pass
+        for process in self.processes:
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+
+
+def create_front_app(router: ShardRouter) -> web.Application:
+    """Создаёт приложение-приёмник вебхука, передающее обновления в шарды"""
+    if not WEBHOOK_SECRET:
+        raise RuntimeError("Для режима sharded необходимо задать WEBHOOK_SECRET")
+
+    async def handle_update(request: web.Request) -> web.Response:
+        secret = request.headers.get("X-Telegram-Bot-Api-Secret-Token")
+        if not hmac.compare_digest((secret or "").encode(), WEBHOOK_SECRET.encode()):
+            return web.Response(status=401, text="Unauthorized")
+        try:
+            update = await request.json()
+        except ValueError:
+            return web.Response(status=400, text="Bad Request")
+        await asyncio.to_thread(router.route, update)
+        return web.json_response({})
+
+    app = web.Application()
+    app.router.add_post(WEBHOOK_PATH, handle_update)
+    return app
+
+
+async def run_sharded(shards: Optional[int] = None):
+    """Запуск в режиме шардирования: приёмник вебхука и N воркеров"""
+    from bot.bot import create_bot, handle_stop_signals
+
+    shards = shards or SHARD_WORKERS or os.cpu_count() or 1
+    router = ShardRouter(shards, args=(shards,))
+    router.start()
+
+    bot = create_bot()
+    if WEBHOOK_URL:
+        await bot.set_webhook(
+            WEBHOOK_URL.rstrip("/") + WEBHOOK_PATH,
+            secret_token=WEBHOOK_SECRET,
+            allowed_updates=ALLOWED_UPDATES,
+        )
+    await bot.session.close()
+
+    runner = web.AppRunner(create_front_app(router))
+    await runner.setup()
+    await web.TCPSite(runner, WEBHOOK_HOST, WEBHOOK_PORT).start()
+
+    logger.info(
+        f"Бот запущен (sharded, {shards} воркеров) на "
+        f"http://{WEBHOOK_HOST}:{WEBHOOK_PORT}{WEBHOOK_PATH}"
+    )
+    stop = asyncio.Event()
+    remove_handlers = handle_stop_signals(stop.set)
+    try:
+        await stop.wait()
+        logger.info("Получен сигнал остановки, завершаем работу")
+    finally:
+        remove_handlers()
+        await runner.cleanup()
+        await asyncio.to_thread(router.stop)
@@ -0,0 +1,140 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Set, Tuple
+
+from aiogram.types import Update
+
+from core.config import UPDATE_CONCURRENCY, UPDATE_QUEUE_LIMIT, logger
+from core.metrics import registry
+
+UpdateHandler = Callable[[Any], Awaitable[Any]]
+
+queue_wait = registry.histogram(
+    "cleaner_update_queue_wait_seconds",
+    "Time an update spent queued before its handler started",
+)
+
+
+def update_chat_id(update: Update) -> Optional[int]:
+    """Чат, к которому относится разобранное обновление"""
+    try:
+        event = update.event
+    except Exception:
+        return None
+
+    chat = getattr(event, "chat", None)
+    if chat is None:
+        chat = getattr(getattr(event, "message", None), "chat", None)
+    return chat.id if chat is not None else None
+
+
+class UpdateScheduler:
+    """Обработка обновлений: общий лимит параллельности, очередь на чат, обход чатов по кругу"""
+
+    def __init__(self, concurrency: int, max_pending: int):
+        self.concurrency = concurrency
+        self.max_pending = max_pending
+        self.handler: Optional[UpdateHandler] = None
+        self.processed = 0
+        self.failed = 0
+        self.backpressure_waits = 0
+        self._queues: Dict[Optional[int], Deque[Tuple[Any, float]]] = {}
+        self._ready: Deque[Optional[int]] = deque()
+        self._active: Set[Optional[int]] = set()
+        self._tasks: Set[asyncio.Task] = set()
+        self._pending = 0
+        self._space = asyncio.Event()
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    def start(self, handler: UpdateHandler):
+        self.handler = handler
+
+    async def submit(self, chat_id: Optional[int], update: Any):
+        """Ставит обновление в очередь чата; ждёт, если очередь переполнена"""
+        while self._pending >= self.max_pending:
+            self.backpressure_waits += 1
+            self._space.clear()
+            await self._space.wait()
+
+        self._pending += 1
+        self._idle.clear()
+
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = deque()
+        queue.append((update, time.monotonic()))
+        if len(queue) == 1 and chat_id not in self._active:
+            self._ready.append(chat_id)
+        self._dispatch()
+
+    async def join(self):
+        """Дожидается обработки всех принятых обновлений"""
+        await self._idle.wait()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "running": len(self._active),
+            "pending": self._pending,
+            "chats": len(self._queues),
+            "processed": self.processed,
+            "failed": self.failed,
+            "backpressure_waits": self.backpressure_waits,
+        }
+
+    def _dispatch(self):
+        while self._ready and len(self._active) < self.concurrency:
+            chat_id = self._ready.popleft()
+            update, queued_at = self._queues[chat_id].popleft()
+            queue_wait.observe(time.monotonic() - queued_at)
+            self._active.add(chat_id)
+            task = asyncio.create_task(self._run(chat_id, update))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, chat_id: Optional[int], update: Any):
+        try:
+            await self.handler(update)
+        except Exception as e:
+            self.failed += 1
+            logger.error(f"Error handling update for chat {chat_id}: {e}")
+        finally:
+            self.processed += 1
+            self._pending -= 1
+            self._active.discard(chat_id)
+
+            if self._queues[chat_id]:
+                self._ready.append(chat_id)
+            else:
+                del self._queues[chat_id]
+
+            if self._pending < self.max_pending:
+                self._space.set()
+            if not self._pending:
+                self._idle.set()
+            self._dispatch()
+
+
+update_scheduler = UpdateScheduler(
+    concurrency=UPDATE_CONCURRENCY, max_pending=UPDATE_QUEUE_LIMIT
+)
+
+registry.gauge_callback(
+    "cleaner_update_queue",
+    "Updates being handled, waiting in chat queues, and chats with queued updates",
+    lambda: {
+        ("running",): update_scheduler.stats()["running"],
+        ("pending",): update_scheduler.stats()["pending"],
+        ("chats",): update_scheduler.stats()["chats"],
+    },
+    ["kind"],
+)
+registry.counter_callback(
+    "cleaner_update_backpressure_waits_total",
+    "Times update intake waited because the queue limit was reached",
+    lambda: {(): update_scheduler.backpressure_waits},
+)
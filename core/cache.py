@@ -0,0 +1,246 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import time
+from collections import OrderedDict, deque
+from dataclasses import dataclass, field
+from typing import Any, Callable, Deque, Dict, Hashable, Optional, Set, Tuple
+
+
+class AdminCache:
+    """TTL-кэш статуса администратора с ограничением размера (LRU)"""
+
+    def __init__(self, ttl: float, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple[int, int], Tuple[bool, float]]" = (
+            OrderedDict()
+        )
+        self._by_chat: Dict[int, Set[int]] = {}
+
+    def get(self, chat_id: int, user_id: int) -> Optional[bool]:
+        key = (chat_id, user_id)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        is_admin, expires_at = entry
+        if expires_at <= time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return is_admin
+
+    def set(self, chat_id: int, user_id: int, is_admin: bool):
+        key = (chat_id, user_id)
+        self._entries[key] = (is_admin, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        self._by_chat.setdefault(chat_id, set()).add(user_id)
+
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+
+    def invalidate(self, chat_id: int, user_id: Optional[int] = None):
+        if user_id is not None:
+            self._remove((chat_id, user_id))
+            return
+
+        for cached_user_id in self._by_chat.pop(chat_id, set()):
+            self._entries.pop((chat_id, cached_user_id), None)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+    def _remove(self, key: Tuple[int, int]):
+        if self._entries.pop(key, None) is None:
+            return
+
+        chat_id, user_id = key
+        users = self._by_chat.get(chat_id)
+        if users is not None:
+            users.discard(user_id)
+            if not users:
+                del self._by_chat[chat_id]
+
+
+class ChatAdminIndex:
+    """Множества администраторов чатов, загруженные через getChatAdministrators"""
+
+    def __init__(self, ttl: float, max_chats: int):
+        self.ttl = ttl
+        self.max_chats = max_chats
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+        self._entries: "OrderedDict[int, Tuple[Set[int], float]]" = OrderedDict()
+
+    def get(self, chat_id: int) -> Optional[Set[int]]:
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        admin_ids, expires_at = entry
+        if expires_at <= time.monotonic():
+            del self._entries[chat_id]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(chat_id)
+        self.hits += 1
+        return admin_ids
+
+    def set(self, chat_id: int, admin_ids: Set[int]):
+        self.refreshes += 1
+        self._entries[chat_id] = (set(admin_ids), time.monotonic() + self.ttl)
+        self._entries.move_to_end(chat_id)
+
+        while len(self._entries) > self.max_chats:
+            self._entries.popitem(last=False)
+
+    def update_member(self, chat_id: int, user_id: int, is_admin: bool):
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            return
+
+        admin_ids, _ = entry
+        if is_admin:
+            admin_ids.add(user_id)
+        else:
+            admin_ids.discard(user_id)
+
+    def invalidate(self, chat_id: int):
+        self._entries.pop(chat_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "refreshes": self.refreshes,
+            "size": len(self._entries),
+        }
+
+
+class RenderCache:
+    """LRU-кэш готовых экранов меню (текст и клавиатура) по ключу"""
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+        self.misses += 1
+        entry = build()
+        self._entries[key] = entry
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+@dataclass(slots=True)
+class BreakerState:
+    failures: Deque[float] = field(default_factory=deque)
+    trips: int = 0
+    blocked_until: float = 0.0
+
+
+class DeleteRightsBreaker:
+    """Предохранитель по чатам: после серии отказов в правах удаление не выполняется до паузы.
+
+    Срабатывает, когда за последние window секунд набралось threshold отказов
+    (скользящее окно по времени отказов).
+    """
+
+    def __init__(
+        self,
+        threshold: int,
+        window: float,
+        backoff: float,
+        max_backoff: float,
+        max_chats: int,
+    ):
+        self.threshold = threshold
+        self.window = window
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_chats = max_chats
+        self.trips = 0
+        self.skipped = 0
+        self._entries: "OrderedDict[int, BreakerState]" = OrderedDict()
+
+    def blocked_for(self, chat_id: int) -> float:
+        """Сколько секунд ещё пропускать удаления в чате (0 - удалять можно)"""
+        entry = self._entries.get(chat_id)
+        if entry is None or not entry.trips:
+            return 0.0
+        return max(0.0, entry.blocked_until - time.monotonic())
+
+    def allow(self, chat_id: int) -> bool:
+        if self.blocked_for(chat_id):
+            self.skipped += 1
+            return False
+        return True
+
+    def record_failure(self, chat_id: int):
+        entry = self._entries.get(chat_id)
+        if entry is None:
+            entry = self._entries[chat_id] = BreakerState()
+        self._entries.move_to_end(chat_id)
+
+        now = time.monotonic()
+        failures = entry.failures
+        failures.append(now)
+        while failures and failures[0] <= now - self.window:
+            failures.popleft()
+        while len(failures) > self.threshold:
+            failures.popleft()
+
+        if entry.trips or len(failures) >= self.threshold:
+            delay = min(self.backoff * 2**entry.trips, self.max_backoff)
+            entry.trips += 1
+            entry.blocked_until = now + delay
+            self.trips += 1
+
+        while len(self._entries) > self.max_chats:
+            self._entries.popitem(last=False)
+
+    def record_success(self, chat_id: int):
+        if chat_id in self._entries:
+            del self._entries[chat_id]
+
+    def reset(self, chat_id: int):
+        self._entries.pop(chat_id, None)
+
+    def stats(self) -> Dict[str, int]:
+        now = time.monotonic()
+        return {
+            "tracked": len(self._entries),
+            "tripped": sum(
+                1
+                for entry in self._entries.values()
+                if entry.trips and entry.blocked_until > now
+            ),
+            "trips": self.trips,
+            "skipped": self.skipped,
+        }
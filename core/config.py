@@ -9,3 +9,52 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 BOT_TOKEN = ""
+API_BASE_URL = ""
+
+ADMIN_CACHE_TTL = 300
+ADMIN_CACHE_MAX_SIZE = 10000
+
+ADMIN_LIST_TTL = 600
+ADMIN_LIST_MAX_CHATS = 50000
+
+MENU_CACHE_MAX_SIZE = 5000
+
+DELETE_BATCH_WINDOW = 0.5
+DELETE_BATCH_MAX_SIZE = 100
+
+DELETE_BREAKER_THRESHOLD = 3
+DELETE_BREAKER_WINDOW = 600
+DELETE_BREAKER_BACKOFF = 60
+DELETE_BREAKER_MAX_BACKOFF = 3600
+DELETE_BREAKER_MAX_CHATS = 10000
+
+DATABASE_PATH = "data/bot.db"
+SETTINGS_FLUSH_INTERVAL = 5
+SETTINGS_CACHE_MAX_CHATS = 20000
+
+FSM_SESSION_TTL = 900
+FSM_MAX_SESSIONS = 10000
+FSM_PERSIST = True
+
+RUN_MODE = "polling"
+
+ALLOWED_UPDATES = ["message", "callback_query", "chat_member", "my_chat_member"]
+POLLING_TIMEOUT = 30
+UPDATE_CONCURRENCY = 100
+UPDATE_QUEUE_LIMIT = 10000
+
+SHARD_WORKERS = 0
+
+WEBHOOK_HOST = "0.0.0.0"
+WEBHOOK_PORT = 8080
+WEBHOOK_PATH = "/webhook"
+WEBHOOK_SECRET = ""
+WEBHOOK_URL = ""
+
+RATE_LIMIT_GLOBAL_PER_SECOND = 30
+RATE_LIMIT_CHAT_PER_MINUTE = 20
+RATE_LIMIT_MAX_RETRIES = 5
+RATE_LIMIT_MAX_CHAT_BUCKETS = 10000
+
+METRICS_HOST = "127.0.0.1"
+METRICS_PORT = 9100
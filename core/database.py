@@ -0,0 +1,90 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Iterable, List, Optional, Sequence
+
+
+class Database:
+    """Потокобезопасное подключение к локальной SQLite-базе в режиме WAL.
+
+    Чтения идут через отдельное подключение: в WAL они не ждут пишущую
+    транзакцию, поэтому промах кэша не стоит на блокировке, которую держит
+    пакетная запись в фоновом потоке.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._connection: Optional[sqlite3.Connection] = None
+        self._reader: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._schema: List[str] = []
+
+    def register_schema(self, statement: str):
+        self._schema.append(statement)
+        if self._connection is not None:
+            with self._lock:
+                self._connection.execute(statement)
+
+    def execute(self, statement: str, params: Sequence[Any] = ()):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(statement, params)
+
+    def executemany(self, statement: str, rows: Iterable[Sequence[Any]]):
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.executemany(statement, rows)
+
+    def fetchone(self, statement: str, params: Sequence[Any] = ()):
+        if self.path == ":memory:":
+            with self._lock:
+                return self._connect().execute(statement, params).fetchone()
+        with self._read_lock:
+            return self._connect_reader().execute(statement, params).fetchone()
+
+    def fetchall(self, statement: str, params: Sequence[Any] = ()):
+        if self.path == ":memory:":
+            with self._lock:
+                return self._connect().execute(statement, params).fetchall()
+        with self._read_lock:
+            return self._connect_reader().execute(statement, params).fetchall()
+
+    def close(self):
+        with self._read_lock:
+            if self._reader is not None:
+                self._reader.close()
+                self._reader = None
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            if self.path != ":memory:":
+                Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA busy_timeout=5000")
+            for statement in self._schema:
+                connection.execute(statement)
+            connection.commit()
+            self._connection = connection
+        return self._connection
+
+    def _connect_reader(self) -> sqlite3.Connection:
+        if self._reader is None:
+            with self._lock:
+                self._connect()
+            connection = sqlite3.connect(self.path, check_same_thread=False)
+            connection.execute("PRAGMA query_only=ON")
+            connection.execute("PRAGMA busy_timeout=5000")
+            self._reader = connection
+        return self._reader
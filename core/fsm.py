@@ -0,0 +1,204 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Mapping, Optional, Set
+
+from aiogram.exceptions import DataNotDictLikeError
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StateType, StorageKey
+
+from core.config import logger
+
+
+@dataclass(slots=True)
+class FSMSession:
+    state: Optional[str] = None
+    data: Dict[str, Any] = field(default_factory=dict)
+    expires_at: float = 0.0
+
+
+def encode_key(key: StorageKey) -> str:
+    return json.dumps(
+        [
+            key.bot_id,
+            key.chat_id,
+            key.user_id,
+            key.thread_id,
+            key.business_connection_id,
+            key.destiny,
+        ]
+    )
+
+
+def decode_key(raw: str) -> StorageKey:
+    return StorageKey(*json.loads(raw))
+
+
+class BoundedFSMStorage(BaseStorage):
+    """FSM-хранилище с истечением брошенных сессий, LRU-ограничением и записью в SQLite"""
+
+    def __init__(
+        self,
+        ttl: float,
+        max_sessions: int,
+        store=None,
+        flush_interval: float = 5,
+    ):
+        self.ttl = ttl
+        self.max_sessions = max_sessions
+        self.store = store
+        self.flush_interval = flush_interval
+        self.expired = 0
+        self.evicted = 0
+        self._sessions: "OrderedDict[StorageKey, FSMSession]" = OrderedDict()
+        self._dirty: Set[StorageKey] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        state = state.state if isinstance(state, State) else state
+        session = self._live(key)
+        if session is None:
+            if state is None:
+                return
+            session = FSMSession()
+        session.state = state
+        self._save(key, session)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        session = self._live(key)
+        return session.state if session is not None else None
+
+    async def set_data(self, key: StorageKey, data: Mapping[str, Any]) -> None:
+        if not isinstance(data, dict):
+            raise DataNotDictLikeError(
+                f"Data must be a dict or dict-like object, got {type(data).__name__}"
+            )
+        session = self._live(key)
+        if session is None:
+            if not data:
+                return
+            session = FSMSession()
+        session.data = data.copy()
+        self._save(key, session)
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        session = self._live(key)
+        return session.data.copy() if session is not None else {}
+
+    async def close(self) -> None:
+        await self.stop()
+
+    def sweep(self) -> int:
+        """Удаляет истёкшие сессии; они упорядочены по сроку, поэтому проверяется начало"""
+        now = time.time()
+        removed = 0
+        while self._sessions:
+            key, session = next(iter(self._sessions.items()))
+            if session.expires_at > now:
+                break
+            self._drop(key)
+            removed += 1
+        self.expired += removed
+        return removed
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "sessions": len(self._sessions),
+            "expired": self.expired,
+            "evicted": self.evicted,
+        }
+
+    async def flush(self):
+        if self.store is None or not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        saved = []
+        removed = []
+        for key in dirty:
+            session = self._sessions.get(key)
+            if session is None:
+                removed.append(encode_key(key))
+                continue
+            try:
+                data = json.dumps(session.data)
+            except (TypeError, ValueError) as e:
+                logger.error(f"FSM data for {key} is not serializable: {e}")
+                continue
+            saved.append((encode_key(key), session.state, data, session.expires_at))
+
+        try:
+            await asyncio.to_thread(self.store.apply, saved, removed)
+        except Exception as e:
+            logger.error(f"Error saving FSM sessions: {e}")
+            self._dirty |= dirty
+
+    async def start(self):
+        """Восстанавливает живые сессии из базы и запускает фоновую очистку"""
+        if self.store is not None:
+            try:
+                rows = await asyncio.to_thread(self.store.load_all, time.time())
+            except Exception as e:
+                logger.error(f"Error loading FSM sessions: {e}")
+                rows = []
+
+            for raw_key, state, data, expires_at in sorted(rows, key=lambda r: r[3]):
+                key = decode_key(raw_key)
+                self._sessions[key] = FSMSession(state, json.loads(data), expires_at)
+            self._evict()
+
+            if rows:
+                logger.info(f"Restored {len(self._sessions)} FSM sessions")
+
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    def _live(self, key: StorageKey) -> Optional[FSMSession]:
+        session = self._sessions.get(key)
+        if session is not None and session.expires_at <= time.time():
+            self._drop(key)
+            self.expired += 1
+            return None
+        return session
+
+    def _save(self, key: StorageKey, session: FSMSession):
+        if session.state is None and not session.data:
+            self._drop(key)
+            return
+
+        session.expires_at = time.time() + self.ttl
+        self._sessions[key] = session
+        self._sessions.move_to_end(key)
+        self._dirty.add(key)
+        self._evict()
+
+    def _evict(self):
+        while len(self._sessions) > self.max_sessions:
+            key, _ = self._sessions.popitem(last=False)
+            self._dirty.add(key)
+            self.evicted += 1
+
+    def _drop(self, key: StorageKey):
+        if self._sessions.pop(key, None) is not None:
+            self._dirty.add(key)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            self.sweep()
+            await self.flush()
@@ -1,7 +1,373 @@
 # SPDX-License-Identifier: MIT
 # Copyright (C) 2026 CodWiz
 
-from typing import Dict
-from domain.models import ChatConfig
+import asyncio
+import json
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 
-chat_settings: Dict[int, ChatConfig] = {}
+from core.cache import AdminCache, ChatAdminIndex, DeleteRightsBreaker
+from core.config import (
+    ADMIN_CACHE_TTL,
+    ADMIN_CACHE_MAX_SIZE,
+    ADMIN_LIST_TTL,
+    ADMIN_LIST_MAX_CHATS,
+    DATABASE_PATH,
+    DELETE_BREAKER_BACKOFF,
+    DELETE_BREAKER_MAX_BACKOFF,
+    DELETE_BREAKER_MAX_CHATS,
+    DELETE_BREAKER_THRESHOLD,
+    DELETE_BREAKER_WINDOW,
+    FSM_MAX_SESSIONS,
+    FSM_PERSIST,
+    FSM_SESSION_TTL,
+    SETTINGS_CACHE_MAX_CHATS,
+    SETTINGS_FLUSH_INTERVAL,
+    logger,
+)
+from core.database import Database
+from core.fsm import BoundedFSMStorage, decode_key
+from core.metrics import registry
+from domain.models import DEFAULT_CHAT_CONFIG, ChatConfig
+
+
+class SettingsBackend(ABC):
+    """Интерфейс постоянного хранилища настроек чатов"""
+
+    @abstractmethod
+    def load(self, chat_id: int) -> Optional[ChatConfig]: ...
+
+    @abstractmethod
+    def save_many(self, configs: Dict[int, dict]): ...
+
+
+class SQLiteSettingsBackend(SettingsBackend):
+    """Хранение настроек чатов в SQLite (JSON на чат)"""
+
+    def __init__(self, database: Database):
+        self.database = database
+        database.register_schema(
+            "CREATE TABLE IF NOT EXISTS chat_settings ("
+            "chat_id INTEGER PRIMARY KEY, data TEXT NOT NULL)"
+        )
+
+    def load(self, chat_id: int) -> Optional[ChatConfig]:
+        row = self.database.fetchone(
+            "SELECT data FROM chat_settings WHERE chat_id = ?", (chat_id,)
+        )
+        return ChatConfig.from_dict(json.loads(row[0])) if row else None
+
+    def save_many(self, configs: Dict[int, dict]):
+        self.database.executemany(
+            "INSERT OR REPLACE INTO chat_settings (chat_id, data) VALUES (?, ?)",
+            [
+                (chat_id, json.dumps(data, separators=(",", ":")))
+                for chat_id, data in configs.items()
+            ],
+        )
+
+
+class PendingDeletionStore:
+    """Журнал запланированных удалений сообщений бота в SQLite.
+
+    В режиме sharded воркеры делят одну базу, поэтому shard = (номер, всего)
+    ограничивает загрузку чатами своего шарда.
+    """
+
+    def __init__(self, database: Database, shard: Optional[Tuple[int, int]] = None):
+        self.database = database
+        self.shard = shard
+        database.register_schema(
+            "CREATE TABLE IF NOT EXISTS pending_deletions ("
+            "chat_id INTEGER NOT NULL, message_id INTEGER NOT NULL, "
+            "due_at REAL NOT NULL, PRIMARY KEY (chat_id, message_id))"
+        )
+
+    def load_all(self) -> List[Tuple[int, int, float]]:
+        if self.shard is None:
+            return self.database.fetchall(
+                "SELECT chat_id, message_id, due_at FROM pending_deletions"
+            )
+
+        # Остаток в SQLite сохраняет знак делимого, а shard_for берёт его по модулю
+        shard_id, shards = self.shard
+        return self.database.fetchall(
+            "SELECT chat_id, message_id, due_at FROM pending_deletions "
+            "WHERE ((chat_id % ?) + ?) % ? = ?",
+            (shards, shards, shards, shard_id),
+        )
+
+    def apply(
+        self,
+        added: Iterable[Tuple[int, int, float]],
+        removed: Iterable[Tuple[int, int]],
+    ):
+        self.database.executemany(
+            "DELETE FROM pending_deletions WHERE chat_id = ? AND message_id = ?",
+            removed,
+        )
+        self.database.executemany(
+            "INSERT OR REPLACE INTO pending_deletions "
+            "(chat_id, message_id, due_at) VALUES (?, ?, ?)",
+            added,
+        )
+
+
+class FSMSessionStore:
+    """Сессии меню настроек (состояние FSM и данные) в SQLite"""
+
+    def __init__(self, database: Database, shard: Optional[Tuple[int, int]] = None):
+        self.database = database
+        self.shard = shard
+        database.register_schema(
+            "CREATE TABLE IF NOT EXISTS fsm_sessions ("
+            "key TEXT PRIMARY KEY, state TEXT, data TEXT NOT NULL, "
+            "expires_at REAL NOT NULL)"
+        )
+
+    def load_all(self, now: float) -> List[Tuple[str, Optional[str], str, float]]:
+        self.database.execute("DELETE FROM fsm_sessions WHERE expires_at <= ?", (now,))
+        rows = self.database.fetchall(
+            "SELECT key, state, data, expires_at FROM fsm_sessions"
+        )
+        if self.shard is None:
+            return rows
+
+        shard_id, shards = self.shard
+        return [row for row in rows if decode_key(row[0]).chat_id % shards == shard_id]
+
+    def apply(
+        self,
+        saved: Iterable[Tuple[str, Optional[str], str, float]],
+        removed: Iterable[str],
+    ):
+        self.database.executemany(
+            "DELETE FROM fsm_sessions WHERE key = ?", [(key,) for key in removed]
+        )
+        self.database.executemany(
+            "INSERT OR REPLACE INTO fsm_sessions "
+            "(key, state, data, expires_at) VALUES (?, ?, ?, ?)",
+            saved,
+        )
+
+
+class ChatSettingsStore:
+    """Кэш настроек чатов с чтением из хранилища и отложенной записью"""
+
+    def __init__(
+        self, backend: SettingsBackend, flush_interval: float, max_cached: int
+    ):
+        self.backend = backend
+        self.flush_interval = flush_interval
+        self.max_cached = max_cached
+        self.loads = 0
+        self.evicted = 0
+        self._configs: "OrderedDict[int, ChatConfig]" = OrderedDict()
+        self._dirty: Set[int] = set()
+        self._saving: Set[int] = set()
+        self._task: Optional[asyncio.Task] = None
+
+    def get(self, chat_id: int) -> Optional[ChatConfig]:
+        config = self.get_config(chat_id)
+        return None if config.frozen else config
+
+    def get_config(self, chat_id: int) -> ChatConfig:
+        """Настройки чата; для чатов без своих настроек — общий DEFAULT_CHAT_CONFIG"""
+        try:
+            return self._load(chat_id)
+        except Exception as e:
+            logger.error(f"Error loading settings for chat {chat_id}: {e}")
+            return DEFAULT_CHAT_CONFIG
+
+    def edit(self, chat_id: int) -> ChatConfig:
+        """Изменяемые настройки чата: общий дефолт копируется при первом изменении.
+
+        Ошибка загрузки пробрасывается: копия дефолта вместо несчитанных
+        настроек перезаписала бы сохранённые при следующей записи.
+        """
+        config = self._load(chat_id)
+        if config.frozen:
+            config = config.copy()
+            self._configs[chat_id] = config
+        return config
+
+    def __contains__(self, chat_id: int) -> bool:
+        return self.get(chat_id) is not None
+
+    def __getitem__(self, chat_id: int) -> ChatConfig:
+        config = self.get(chat_id)
+        if config is None:
+            raise KeyError(chat_id)
+        return config
+
+    def __setitem__(self, chat_id: int, config: ChatConfig):
+        if chat_id not in self._configs:
+            self._evict(reserve=1)
+        self._configs[chat_id] = config
+        self._configs.move_to_end(chat_id)
+
+    def __len__(self) -> int:
+        return len(self._configs)
+
+    def mark_dirty(self, chat_id: int):
+        config = self._configs.get(chat_id)
+        if config is not None and not config.frozen:
+            self._dirty.add(chat_id)
+
+    async def flush(self):
+        if not self._dirty:
+            return
+
+        dirty, self._dirty = self._dirty, set()
+        snapshot = {chat_id: self._configs[chat_id].to_dict() for chat_id in dirty}
+        self._saving |= dirty
+        try:
+            await asyncio.to_thread(self.backend.save_many, snapshot)
+        except Exception as e:
+            logger.error(f"Error saving chat settings: {e}")
+            self._dirty |= dirty
+            return
+        finally:
+            self._saving -= dirty
+        self._evict()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "cached": len(self._configs),
+            "dirty": len(self._dirty),
+            "loads": self.loads,
+            "evicted": self.evicted,
+        }
+
+    def _load(self, chat_id: int) -> ChatConfig:
+        config = self._configs.get(chat_id)
+        if config is not None:
+            self._configs.move_to_end(chat_id)
+            return config
+
+        self.loads += 1
+        config = self.backend.load(chat_id)
+        if config is None:
+            config = DEFAULT_CHAT_CONFIG
+        self._evict(reserve=1)
+        self._configs[chat_id] = config
+        return config
+
+    def _evict(self, reserve: int = 0):
+        """Выгружает давно не использованные настройки.
+
+        Несохранённые и записываемые прямо сейчас не трогает: иначе повторная
+        загрузка вернула бы из базы старую версию.
+        """
+        pinned = self._dirty | self._saving
+        skipped = 0
+        while len(self._configs) + reserve > self.max_cached:
+            chat_id, config = self._configs.popitem(last=False)
+            if chat_id in pinned:
+                self._configs[chat_id] = config
+                if skipped == len(pinned):
+                    break
+                skipped += 1
+                continue
+            self.evicted += 1
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+database = Database(DATABASE_PATH)
+chat_settings = ChatSettingsStore(
+    SQLiteSettingsBackend(database),
+    flush_interval=SETTINGS_FLUSH_INTERVAL,
+    max_cached=SETTINGS_CACHE_MAX_CHATS,
+)
+pending_deletions = PendingDeletionStore(database)
+fsm_storage = BoundedFSMStorage(
+    ttl=FSM_SESSION_TTL,
+    max_sessions=FSM_MAX_SESSIONS,
+    store=FSMSessionStore(database) if FSM_PERSIST else None,
+    flush_interval=SETTINGS_FLUSH_INTERVAL,
+)
+admin_cache = AdminCache(ttl=ADMIN_CACHE_TTL, max_size=ADMIN_CACHE_MAX_SIZE)
+admin_index = ChatAdminIndex(ttl=ADMIN_LIST_TTL, max_chats=ADMIN_LIST_MAX_CHATS)
+delete_breaker = DeleteRightsBreaker(
+    threshold=DELETE_BREAKER_THRESHOLD,
+    window=DELETE_BREAKER_WINDOW,
+    backoff=DELETE_BREAKER_BACKOFF,
+    max_backoff=DELETE_BREAKER_MAX_BACKOFF,
+    max_chats=DELETE_BREAKER_MAX_CHATS,
+)
+
+registry.counter_callback(
+    "cleaner_admin_cache_lookups_total",
+    "Admin status lookups by cache and result",
+    lambda: {
+        ("user", "hit"): admin_cache.hits,
+        ("user", "miss"): admin_cache.misses,
+        ("chat_list", "hit"): admin_index.hits,
+        ("chat_list", "miss"): admin_index.misses,
+    },
+    ["cache", "result"],
+)
+registry.gauge_callback(
+    "cleaner_admin_cache_entries",
+    "Entries held in admin caches",
+    lambda: {
+        ("user",): admin_cache.stats()["size"],
+        ("chat_list",): admin_index.stats()["size"],
+    },
+    ["cache"],
+)
+registry.gauge_callback(
+    "cleaner_fsm_sessions",
+    "Live settings menu sessions",
+    lambda: {(): fsm_storage.stats()["sessions"]},
+)
+registry.counter_callback(
+    "cleaner_fsm_sessions_dropped_total",
+    "Settings menu sessions dropped by reason",
+    lambda: {
+        ("expired",): fsm_storage.expired,
+        ("evicted",): fsm_storage.evicted,
+    },
+    ["reason"],
+)
+registry.gauge_callback(
+    "cleaner_chat_settings_cached",
+    "Chat configurations held in memory",
+    lambda: {(): len(chat_settings)},
+)
+registry.counter_callback(
+    "cleaner_chat_settings_events_total",
+    "Chat configuration loads from the database and evictions from memory",
+    lambda: {("load",): chat_settings.loads, ("evict",): chat_settings.evicted},
+    ["event"],
+)
+registry.gauge_callback(
+    "cleaner_delete_breaker_tripped",
+    "Chats where deletions are paused after repeated permission failures",
+    lambda: {(): delete_breaker.stats()["tripped"]},
+)
+registry.counter_callback(
+    "cleaner_delete_breaker_events_total",
+    "Deletion circuit breaker trips and deletions skipped while tripped",
+    lambda: {("trip",): delete_breaker.trips, ("skip",): delete_breaker.skipped},
+    ["event"],
+)
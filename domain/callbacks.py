@@ -0,0 +1,52 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+from enum import Enum
+from typing import Optional
+
+from aiogram.filters.callback_data import CallbackData
+
+VERSION_MASK = 0xFFFF
+
+
+class MenuOp(str, Enum):
+    MAIN = "m"
+    TIME = "t"
+    WHITELIST = "w"
+    AUTO_DELETE = "a"
+    STATUS = "s"
+    DELETE_ON = "on"
+    DELETE_OFF = "off"
+    TIME_ALWAYS = "ta"
+    TIME_RANGE = "tr"
+    WHITELIST_ADD = "wa"
+    WHITELIST_REMOVE = "wr"
+    WHITELIST_DROP = "rm"
+    AUTO_DELETE_TOGGLE = "ad"
+    AUTO_DELETE_TIME = "at"
+    SIGNATURES = "g"
+    SIGNATURE_ADD = "ga"
+    SIGNATURE_REMOVE = "gr"
+    SIGNATURE_DROP = "gd"
+
+
+class MenuCallback(CallbackData, prefix="s1"):
+    """callback_data меню настроек: префикс версии схемы, код операции и аргументы"""
+
+    op: MenuOp
+    index: int = 0
+    version: int = 0
+
+
+def menu_data(op: MenuOp, index: int = 0, version: int = 0) -> str:
+    return MenuCallback(op=op, index=index, version=version & VERSION_MASK).pack()
+
+
+def parse_menu_data(data: Optional[str]) -> Optional[MenuCallback]:
+    """Разбирает callback_data; для устаревших и чужих данных возвращает None"""
+    if not data:
+        return None
+    try:
+        return MenuCallback.unpack(data)
+    except (TypeError, ValueError):
+        return None
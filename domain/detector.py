@@ -0,0 +1,55 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import re
+from typing import Iterable, Optional, Pattern
+
+DEFAULT_SIGNATURES = (
+    "via",
+    "с помощью",
+    "c помощью",
+    "через",
+    "with",
+    "by",
+)
+
+BOT_USERNAME = re.compile(r"@\w+[Bb]ot\b")
+
+SIGNATURE_WINDOW = 64
+
+
+def compile_signatures(signatures: Iterable[str]) -> Optional[Pattern]:
+    """Собирает подписи в одно выражение для проверки текста перед «@».
+
+    Выражение применяется к развёрнутому фрагменту, поэтому совпадение
+    проверяется от позиции username назад без сканирования всего текста.
+    """
+    reversed_signatures = [
+        r"\s+".join(re.escape(word[::-1]) for word in reversed(signature.split()))
+        for signature in signatures
+        if signature.strip()
+    ]
+    if not reversed_signatures:
+        return None
+    return re.compile(r"\s+(?:" + "|".join(reversed_signatures) + ")", re.IGNORECASE)
+
+
+class InlineSignatureDetector:
+    """Поиск подписей вида «via @bot» за один проход по тексту"""
+
+    def __init__(self, signatures: Iterable[str] = DEFAULT_SIGNATURES):
+        self.pattern = compile_signatures(signatures)
+
+    def detect(self, text: str, extra: Optional[Pattern] = None) -> Optional[str]:
+        at = text.find("@")
+        while at != -1:
+            match = BOT_USERNAME.match(text, at)
+            if match:
+                head = text[max(0, at - SIGNATURE_WINDOW) : at][::-1]
+                if self.pattern.match(head) or (extra and extra.match(head)):
+                    return match.group(0)
+            at = text.find("@", at + 1)
+        return None
+
+
+inline_detector = InlineSignatureDetector()
@@ -1,11 +1,43 @@
 # SPDX-License-Identifier: MIT
 # Copyright (C) 2026 CodWiz
 
-from dataclasses import dataclass, field
+import itertools
+import time as _time
+from bisect import bisect_right
+from dataclasses import FrozenInstanceError, dataclass, field
 from datetime import time, datetime
 from enum import Enum
-from typing import Optional, Dict
-import asyncio
+from typing import FrozenSet, List, Optional, Pattern, Set, Union
+
+from domain.detector import compile_signatures
+
+
+def normalize_username(username: str) -> str:
+    return username.strip().lstrip("@").casefold()
+
+
+_version_stamps = itertools.count(1)
+
+
+def _next_version() -> int:
+    return next(_version_stamps)
+
+
+class CopyOnWrite:
+    """Запрет изменения общего экземпляра и новая метка версии при изменении полей"""
+
+    __slots__ = ()
+
+    def __setattr__(self, name: str, value) -> None:
+        if name.startswith("_"):
+            object.__setattr__(self, name, value)
+            return
+        if getattr(self, "_frozen", False):
+            raise FrozenInstanceError(
+                f"cannot assign to field {name!r} of a shared default config"
+            )
+        object.__setattr__(self, name, value)
+        object.__setattr__(self, "_version", _next_version())
 
 
 class DeleteMode(Enum):
@@ -14,13 +46,66 @@ class DeleteMode(Enum):
     DISABLED = "disabled"
 
 
-@dataclass
-class TimeRange:
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+ALL_WEEKDAYS = 0b1111111
+EPOCH_WEEKDAY = 3
+
+
+def _window_bits(start: int, end: int, weekdays: int) -> int:
+    length = (end - start) % MINUTES_PER_DAY or MINUTES_PER_DAY
+    bits = 0
+    for day in range(7):
+        if not weekdays & (1 << day):
+            continue
+        begin = day * MINUTES_PER_DAY + start
+        window = (1 << length) - 1
+        bits |= (window << begin) & ((1 << MINUTES_PER_WEEK) - 1)
+        overflow = begin + length - MINUTES_PER_WEEK
+        if overflow > 0:
+            bits |= (1 << overflow) - 1
+    return bits
+
+
+@dataclass(slots=True)
+class CompiledSchedule:
+    """Скомпилированное расписание и результат последней проверки"""
+
+    bitmap: int
+    transitions: List[int]
+    active: bool = False
+    valid_from: float = 0.0
+    valid_until: float = 0.0
+
+
+@dataclass(slots=True)
+class TimeRange(CopyOnWrite):
+    """Расписание удаления: режим, основное окно и дополнительные окна.
+
+    Окна компилируются в битовую карту минут недели; между границами
+    окон проверка сводится к сравнению текущего времени с кэшированным
+    моментом следующего переключения. Скомпилированное расписание
+    создаётся при первой проверке режима TIME_RANGE.
+    """
+
     start_hour: int = 22
     start_minute: int = 0
     end_hour: int = 8
     end_minute: int = 0
     mode: DeleteMode = DeleteMode.ALWAYS
+    weekdays: int = ALL_WEEKDAYS
+    extra_windows: tuple = ()
+    utc_offset: Optional[int] = None
+    _schedule: Optional[CompiledSchedule] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _frozen: bool = field(default=False, init=False, repr=False, compare=False)
+    _version: int = field(default=0, init=False, repr=False, compare=False)
+
+    def __setattr__(self, name: str, value) -> None:
+        CopyOnWrite.__setattr__(self, name, value)
+        if not name.startswith("_"):
+            object.__setattr__(self, "_schedule", None)
 
     def get_start_time(self) -> time:
         return time(self.start_hour, self.start_minute)
@@ -28,21 +113,93 @@ class TimeRange:
     def get_end_time(self) -> time:
         return time(self.end_hour, self.end_minute)
 
-    def should_delete_at(self, check_time: Optional[time] = None) -> bool:
-        if self.mode == DeleteMode.DISABLED:
-            return False
-        elif self.mode == DeleteMode.ALWAYS:
+    def add_window(self, start: time, end: time, weekdays: int = ALL_WEEKDAYS):
+        self.extra_windows = self.extra_windows + (
+            (start.hour * 60 + start.minute, end.hour * 60 + end.minute, weekdays),
+        )
+
+    def is_active(self, now: Optional[float] = None) -> bool:
+        if self.mode is DeleteMode.ALWAYS:
             return True
-        elif self.mode == DeleteMode.TIME_RANGE:
-            target_time = check_time if check_time else datetime.now().time()
-            start_time = self.get_start_time()
-            end_time = self.get_end_time()
+        if self.mode is not DeleteMode.TIME_RANGE:
+            return False
+
+        if now is None:
+            now = _time.time()
+        schedule = self._schedule
+        if schedule is not None and schedule.valid_from <= now < schedule.valid_until:
+            return schedule.active
+        return self._refresh(now)
+
+    def should_delete_at(self, check_time: Optional[time] = None) -> bool:
+        if check_time is None or self.mode != DeleteMode.TIME_RANGE:
+            return self.is_active()
+
+        bitmap = self._compile().bitmap
+        minute = datetime.now().weekday() * MINUTES_PER_DAY
+        minute += check_time.hour * 60 + check_time.minute
+        return bool(bitmap >> minute & 1)
+
+    def _compile(self) -> CompiledSchedule:
+        if self._schedule is not None:
+            return self._schedule
+
+        windows = [
+            (
+                self.start_hour * 60 + self.start_minute,
+                self.end_hour * 60 + self.end_minute,
+                self.weekdays,
+            )
+        ]
+        windows.extend(tuple(window) for window in self.extra_windows)
 
-            if start_time < end_time:
-                return start_time <= target_time < end_time
+        bitmap = 0
+        for start, end, weekdays in windows:
+            bitmap |= _window_bits(start, end, weekdays)
+
+        rotated = (bitmap << 1 | bitmap >> (MINUTES_PER_WEEK - 1)) & (
+            (1 << MINUTES_PER_WEEK) - 1
+        )
+        changes = bitmap ^ rotated
+        transitions = []
+        while changes:
+            lowest = changes & -changes
+            transitions.append(lowest.bit_length() - 1)
+            changes ^= lowest
+
+        schedule = CompiledSchedule(bitmap, transitions)
+        object.__setattr__(self, "_schedule", schedule)
+        return schedule
+
+    def _refresh(self, now: float) -> bool:
+        schedule = self._compile()
+        transitions = schedule.transitions
+
+        if self.utc_offset is not None:
+            offset = self.utc_offset * 60
+            horizon = now + 7 * 24 * 3600
+        else:
+            offset = _time.localtime(now).tm_gmtoff
+            horizon = now + 3600
+
+        local_minutes = int((now + offset) // 60)
+        minute = (local_minutes + EPOCH_WEEKDAY * MINUTES_PER_DAY) % MINUTES_PER_WEEK
+        active = bool(schedule.bitmap >> minute & 1)
+
+        valid_until = horizon
+        if transitions:
+            index = bisect_right(transitions, minute)
+            if index < len(transitions):
+                next_minute = transitions[index]
             else:
-                return target_time >= start_time or target_time < end_time
-        return False
+                next_minute = transitions[0] + MINUTES_PER_WEEK
+            boundary = (local_minutes + next_minute - minute) * 60 - offset
+            valid_until = min(valid_until, boundary)
+
+        schedule.active = active
+        schedule.valid_from = now
+        schedule.valid_until = valid_until
+        return active
 
     def __str__(self) -> str:
         if self.mode == DeleteMode.ALWAYS:
@@ -54,28 +211,177 @@ class TimeRange:
             end = self.get_end_time().strftime("%H:%M")
             return f"{start} - {end}"
 
+    def to_dict(self) -> dict:
+        return {
+            "start_hour": self.start_hour,
+            "start_minute": self.start_minute,
+            "end_hour": self.end_hour,
+            "end_minute": self.end_minute,
+            "mode": self.mode.value,
+            "weekdays": self.weekdays,
+            "extra_windows": [list(window) for window in self.extra_windows],
+            "utc_offset": self.utc_offset,
+        }
 
-@dataclass
-class AutoDeleteSettings:
+    @classmethod
+    def from_dict(cls, data: dict) -> "TimeRange":
+        return cls(
+            start_hour=data["start_hour"],
+            start_minute=data["start_minute"],
+            end_hour=data["end_hour"],
+            end_minute=data["end_minute"],
+            mode=DeleteMode(data["mode"]),
+            weekdays=data.get("weekdays", ALL_WEEKDAYS),
+            extra_windows=tuple(
+                tuple(window) for window in data.get("extra_windows", ())
+            ),
+            utc_offset=data.get("utc_offset"),
+        )
+
+
+@dataclass(slots=True)
+class AutoDeleteSettings(CopyOnWrite):
     enabled: bool = True
     delete_after: int = 30
+    _frozen: bool = field(default=False, init=False, repr=False, compare=False)
+    _version: int = field(default=0, init=False, repr=False, compare=False)
 
     def __str__(self) -> str:
         if not self.enabled:
             return "Отключено"
         return f"{self.delete_after} секунд"
 
+    def to_dict(self) -> dict:
+        return {"enabled": self.enabled, "delete_after": self.delete_after}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "AutoDeleteSettings":
+        return cls(enabled=data["enabled"], delete_after=data["delete_after"])
+
 
-@dataclass
-class ChatConfig:
+@dataclass(slots=True)
+class ChatConfig(CopyOnWrite):
     whitelist: list = field(default_factory=lambda: ["@gif", "@vid", "@music"])
     time_range: TimeRange = field(default_factory=TimeRange)
     auto_delete: AutoDeleteSettings = field(default_factory=AutoDeleteSettings)
     last_bot_message_id: Optional[int] = None
-    message_tasks: Dict[int, asyncio.Task] = field(default_factory=dict)
+    extra_signatures: tuple = ()
+    signature_pattern: Optional[Pattern] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _whitelist_index: Union[Set[str], FrozenSet[str], None] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _frozen: bool = field(default=False, init=False, repr=False, compare=False)
+    _version: int = field(
+        default_factory=_next_version, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self):
+        if self.extra_signatures:
+            self.signature_pattern = compile_signatures(self.extra_signatures)
+
+    @property
+    def frozen(self) -> bool:
+        return self._frozen
+
+    @property
+    def version(self) -> int:
+        """Метка состояния настроек, меняется при любом их изменении"""
+        return max(self._version, self.time_range._version, self.auto_delete._version)
+
+    def freeze(self) -> "ChatConfig":
+        """Делает конфигурацию неизменяемой для общего использования"""
+        self.whitelist = tuple(self.whitelist)
+        self.extra_signatures = tuple(self.extra_signatures)
+        self._whitelist_index = frozenset(self._index())
+        self.time_range._frozen = True
+        self.auto_delete._frozen = True
+        self._frozen = True
+        return self
+
+    def copy(self) -> "ChatConfig":
+        """Создаёт изменяемую копию конфигурации"""
+        return ChatConfig.from_dict(self.to_dict())
+
+    def _touch(self):
+        if self._frozen:
+            raise FrozenInstanceError("cannot modify a shared default config")
+        self._version = _next_version()
+
+    def _index(self) -> Union[Set[str], FrozenSet[str]]:
+        """Нормализованные имена белого списка, строятся при первой проверке"""
+        if self._whitelist_index is None:
+            self._whitelist_index = {
+                normalize_username(name) for name in self.whitelist
+            }
+        return self._whitelist_index
 
     def is_whitelisted(self, bot_username: str) -> bool:
         if not bot_username:
             return False
-        bot_lower = bot_username.lower()
-        return any(whitelisted.lower() == bot_lower for whitelisted in self.whitelist)
+        return normalize_username(bot_username) in self._index()
+
+    def add_to_whitelist(self, bot_username: str) -> bool:
+        """Добавляет бота; False - бот уже в списке, пустое имя - ValueError"""
+        normalized = normalize_username(bot_username)
+        if not normalized:
+            raise ValueError(f"invalid bot username: {bot_username!r}")
+        if normalized in self._index():
+            return False
+        self._touch()
+        self.whitelist.append(bot_username)
+        self._whitelist_index.add(normalized)
+        return True
+
+    def remove_from_whitelist(self, bot_username: str) -> bool:
+        normalized = normalize_username(bot_username)
+        if normalized not in self._index():
+            return False
+        self._touch()
+        self.whitelist = [
+            name for name in self.whitelist if normalize_username(name) != normalized
+        ]
+        self._whitelist_index.discard(normalized)
+        return True
+
+    def add_signature(self, signature: str) -> bool:
+        signature = " ".join(signature.split())
+        if not signature or signature.lower() in map(str.lower, self.extra_signatures):
+            return False
+        self._touch()
+        self.extra_signatures = self.extra_signatures + (signature,)
+        self.signature_pattern = compile_signatures(self.extra_signatures)
+        return True
+
+    def remove_signature(self, signature: str) -> bool:
+        signature_lower = " ".join(signature.split()).lower()
+        for existing in self.extra_signatures:
+            if existing.lower() == signature_lower:
+                self._touch()
+                self.extra_signatures = tuple(
+                    s for s in self.extra_signatures if s is not existing
+                )
+                self.signature_pattern = compile_signatures(self.extra_signatures)
+                return True
+        return False
+
+    def to_dict(self) -> dict:
+        return {
+            "whitelist": list(self.whitelist),
+            "time_range": self.time_range.to_dict(),
+            "auto_delete": self.auto_delete.to_dict(),
+            "extra_signatures": list(self.extra_signatures),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ChatConfig":
+        return cls(
+            whitelist=list(data["whitelist"]),
+            time_range=TimeRange.from_dict(data["time_range"]),
+            auto_delete=AutoDeleteSettings.from_dict(data["auto_delete"]),
+            extra_signatures=tuple(data.get("extra_signatures", ())),
+        )
+
+
+DEFAULT_CHAT_CONFIG = ChatConfig().freeze()
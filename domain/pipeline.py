@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import inspect
+import time
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from aiogram import Bot
+from aiogram.types import Message
+
+from domain.models import ChatConfig
+
+
+class StageCost(IntEnum):
+    LOCAL = 0
+    CACHED = 1
+    NETWORK = 2
+
+
+@dataclass
+class MessageContext:
+    message: Message
+    bot: Bot
+    config: ChatConfig
+    bot_username: Optional[str] = None
+    is_admin: Optional[bool] = None
+
+
+StageCheck = Callable[[MessageContext], Union[bool, Awaitable[bool]]]
+
+
+@dataclass
+class Stage:
+    name: str
+    cost: StageCost
+    check: StageCheck
+    passed: int = 0
+    exited: int = 0
+    total_time: float = 0.0
+
+
+class FilterPipeline:
+    """Цепочка проверок, упорядоченная по стоимости, с ранним выходом"""
+
+    def __init__(self, stages: List[Stage]):
+        self.stages = sorted(stages, key=lambda stage: stage.cost)
+
+    async def run(self, ctx: MessageContext) -> bool:
+        for stage in self.stages:
+            started = time.perf_counter()
+            result = stage.check(ctx)
+            if inspect.isawaitable(result):
+                result = await result
+            stage.total_time += time.perf_counter() - started
+
+            if not result:
+                stage.exited += 1
+                return False
+            stage.passed += 1
+
+        return True
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            stage.name: {
+                "cost": int(stage.cost),
+                "passed": stage.passed,
+                "exited": stage.exited,
+                "total_time": stage.total_time,
+            }
+            for stage in self.stages
+        }
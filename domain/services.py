@@ -1,16 +1,18 @@
 # SPDX-License-Identifier: MIT
 # Copyright (C) 2026 CodWiz
 
-import re
-from datetime import datetime
 from typing import Optional, Tuple
 
 from aiogram import Bot
 from aiogram.types import Message
 
-from core.storage import chat_settings
+from core.metrics import inline_detected, registry
+from core.storage import chat_settings, delete_breaker
+from domain.detector import inline_detector
 from domain.models import ChatConfig
-from utils.helpers import delete_message_silently, is_admin
+from domain.pipeline import FilterPipeline, MessageContext, Stage, StageCost
+from utils.batch_delete import batch_deleter
+from utils.helpers import is_admin, peek_is_admin
 
 
 async def check_and_handle_inline_bot(message: Message, bot: Bot):
@@ -20,51 +22,93 @@ async def check_and_handle_inline_bot(message: Message, bot: Bot):
     if message.chat.type == "private":
         return
 
-    if chat_id not in chat_settings:
-        chat_settings[chat_id] = ChatConfig()
+    ctx = MessageContext(
+        message=message, bot=bot, config=chat_settings.get_config(chat_id)
+    )
 
-    config = chat_settings[chat_id]
-
-    if message.from_user and await is_admin(bot, chat_id, message.from_user.id):
+    if not await inline_pipeline.run(ctx):
         return
 
-    current_server_time = datetime.now().time()
+    batch_deleter.enqueue(bot, chat_id, message.message_id, guarded=True)
 
-    if not config.time_range.should_delete_at(current_server_time):
-        return
 
-    is_inline_msg, bot_username = await is_inline_bot_message(message)
+def _in_time_window(ctx: MessageContext) -> bool:
+    return ctx.config.time_range.is_active()
 
-    if not is_inline_msg:
-        return
 
-    if bot_username and config.is_whitelisted(bot_username):
-        return
+def _can_delete(ctx: MessageContext) -> bool:
+    return not delete_breaker.blocked_for(ctx.message.chat.id)
+
+
+async def _is_inline(ctx: MessageContext) -> bool:
+    is_inline_msg, ctx.bot_username = await is_inline_bot_message(
+        ctx.message, ctx.config
+    )
+    return is_inline_msg
+
+
+def _not_whitelisted(ctx: MessageContext) -> bool:
+    return not (ctx.bot_username and ctx.config.is_whitelisted(ctx.bot_username))
+
+
+def _not_cached_admin(ctx: MessageContext) -> bool:
+    if not ctx.message.from_user:
+        ctx.is_admin = False
+        return True
+
+    ctx.is_admin = peek_is_admin(ctx.message.chat.id, ctx.message.from_user.id)
+    return not ctx.is_admin
+
+
+async def _not_admin(ctx: MessageContext) -> bool:
+    if ctx.is_admin is not None:
+        return not ctx.is_admin
+    return not await is_admin(
+        ctx.bot, ctx.message.chat.id, ctx.message.from_user.id, cache_checked=True
+    )
+
+
+inline_pipeline = FilterPipeline(
+    [
+        Stage("time_window", StageCost.LOCAL, _in_time_window),
+        Stage("delete_rights", StageCost.LOCAL, _can_delete),
+        Stage("inline_detect", StageCost.LOCAL, _is_inline),
+        Stage("whitelist", StageCost.LOCAL, _not_whitelisted),
+        Stage("admin_cached", StageCost.CACHED, _not_cached_admin),
+        Stage("admin_network", StageCost.NETWORK, _not_admin),
+    ]
+)
 
-    await delete_message_silently(bot, chat_id, message.message_id)
+registry.counter_callback(
+    "cleaner_pipeline_stage_exits_total",
+    "Messages that left the inline-bot pipeline at each stage",
+    lambda: {(stage.name,): stage.exited for stage in inline_pipeline.stages},
+    ["stage"],
+)
+registry.counter_callback(
+    "cleaner_pipeline_stage_seconds_total",
+    "Cumulative time spent in each inline-bot pipeline stage",
+    lambda: {(stage.name,): stage.total_time for stage in inline_pipeline.stages},
+    ["stage"],
+)
 
 
-async def is_inline_bot_message(message: Message) -> Tuple[bool, Optional[str]]:
+async def is_inline_bot_message(
+    message: Message, config: Optional[ChatConfig] = None
+) -> Tuple[bool, Optional[str]]:
     """Определяет, является ли сообщение результатом инлайн-запроса"""
     if message.via_bot:
         username = f"@{message.via_bot.username}" if message.via_bot.username else None
+        inline_detected.inc(method="via_bot")
         return True, username
 
     if message.reply_markup and hasattr(message.reply_markup, "inline_keyboard"):
         text = message.text or message.caption or ""
         if text:
-            patterns = [
-                r"[Vv]ia\s+(@\w+[Bb]ot\b)",
-                r"[Cc]\s+помощью\s+(@\w+[Bb]ot\b)",
-                r"[Чч]ерез\s+(@\w+[Bb]ot\b)",
-                r"[Ww]ith\s+(@\w+[Bb]ot\b)",
-                r"[Bb]y\s+(@\w+[Bb]ot\b)",
-            ]
-
-            for pattern in patterns:
-                match = re.search(pattern, text)
-                if match:
-                    username = match.group(1)
-                    return True, username
+            extra = config.signature_pattern if config else None
+            username = inline_detector.detect(text, extra)
+            if username:
+                inline_detected.inc(method="text_pattern")
+                return True, username
 
     return False, None
@@ -14,3 +14,6 @@ class SettingsState(StatesGroup):
     whitelist_remove = State()
     auto_delete_settings = State()
     auto_delete_time_set = State()
+    signatures_menu = State()
+    signature_add = State()
+    signature_remove = State()
@@ -1,269 +1,256 @@
 # SPDX-License-Identifier: MIT
 # Copyright (C) 2026 CodWiz
 
-from aiogram import Bot, types
+from typing import Awaitable, Callable, Dict, Optional
+
+from aiogram import Bot
 from aiogram.types import CallbackQuery
 from aiogram.fsm.context import FSMContext
 
 from core.storage import chat_settings
+from domain.callbacks import VERSION_MASK, MenuCallback, MenuOp, parse_menu_data
 from domain.states import SettingsState
 from domain.models import DeleteMode
-from domain.models import ChatConfig
 from utils.decorators import admin_required
-from utils.helpers import delete_message_silently, send_message_with_auto_delete
 from handlers.settings_menu import (
+    BACK_TO_AUTO_DELETE_KEYBOARD,
+    BACK_TO_SIGNATURES_KEYBOARD,
+    BACK_TO_TIME_KEYBOARD,
+    BACK_TO_WHITELIST_KEYBOARD,
+    render_menu,
     show_settings_menu,
     show_time_settings,
     show_whitelist_menu,
+    show_whitelist_remove_menu,
+    show_signatures_menu,
+    show_signature_remove_menu,
     show_auto_delete_settings,
     show_status,
 )
 
+CallbackRoute = Callable[
+    [CallbackQuery, Bot, FSMContext, MenuCallback], Awaitable[Optional[str]]
+]
+
 
 @admin_required
 async def handle_settings_callback(
     callback: CallbackQuery, bot: Bot, state: FSMContext
 ):
     """Обработчик callback'ов настроек"""
-    chat_id = callback.message.chat.id
-
-    if chat_id not in chat_settings:
-        chat_settings[chat_id] = ChatConfig()
-
-    config = chat_settings[chat_id]
-    await state.get_data()
-
-    await delete_message_silently(bot, chat_id, callback.message.message_id)
-
-    if callback.data == "toggle_global_off":
-        config.time_range.mode = DeleteMode.DISABLED
-        await callback.answer("Удаление инлайн-сообщений отключено")
-        await show_settings_menu(callback.message, bot, state)
-        return
+    data = parse_menu_data(callback.data)
+    route = CALLBACK_ROUTES.get(data.op) if data is not None else None
 
-    elif callback.data == "toggle_global_on":
-        config.time_range.mode = DeleteMode.ALWAYS
-        await callback.answer("Удаление инлайн-сообщений включено")
+    if route is None:
         await show_settings_menu(callback.message, bot, state)
+        await callback.answer()
         return
 
-    if callback.data == "settings_time":
-        await show_time_settings(callback.message, bot, state)
-
-    elif callback.data == "settings_whitelist":
-        await show_whitelist_menu(callback.message, bot, state)
-
-    elif callback.data == "settings_auto_delete":
-        await show_auto_delete_settings(callback.message, bot, state)
-
-    elif callback.data == "settings_status":
-        await show_status(callback.message, bot, state)
-
-    elif callback.data == "back_to_main":
-        await show_settings_menu(callback.message, bot, state)
-
-    elif callback.data == "back_to_time":
-        await show_time_settings(callback.message, bot, state)
-
-    elif callback.data == "back_to_whitelist":
-        await show_whitelist_menu(callback.message, bot, state)
-
-    elif callback.data == "back_to_auto_delete":
-        await show_auto_delete_settings(callback.message, bot, state)
+    await callback.answer(await route(callback, bot, state, data))
 
-    elif callback.data.startswith("time_"):
-        await handle_time_callback(callback, bot, state)
 
-    elif callback.data.startswith("whitelist_"):
-        await handle_whitelist_callback(callback, bot, state)
+def _screen(show) -> CallbackRoute:
+    async def route(
+        callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+    ) -> Optional[str]:
+        await show(callback.message, bot, state)
+        return None
 
-    elif callback.data.startswith("autodel_"):
-        await handle_auto_delete_callback(callback, bot, state)
+    return route
 
-    elif callback.data.startswith("remove_"):
-        bot_to_remove = callback.data[7:]
-        if bot_to_remove in config.whitelist:
-            config.whitelist.remove(bot_to_remove)
-            await callback.answer(
-                f"Бот {bot_to_remove} удален из белого списка", show_alert=False
-            )
-        await show_whitelist_menu(callback.message, bot, state)
 
-    await callback.answer()
-
-
-async def handle_time_callback(callback: CallbackQuery, bot: Bot, state: FSMContext):
-    """Обработчик callback'ов времени"""
+async def _set_delete_mode(callback: CallbackQuery, mode: DeleteMode):
     chat_id = callback.message.chat.id
-    config = chat_settings[chat_id]
-
-    await delete_message_silently(bot, chat_id, callback.message.message_id)
+    chat_settings.edit(chat_id).time_range.mode = mode
+    chat_settings.mark_dirty(chat_id)
+
+
+async def _delete_off(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    await _set_delete_mode(callback, DeleteMode.DISABLED)
+    await show_settings_menu(callback.message, bot, state)
+    return "Удаление инлайн-сообщений отключено"
+
+
+async def _delete_on(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    await _set_delete_mode(callback, DeleteMode.ALWAYS)
+    await show_settings_menu(callback.message, bot, state)
+    return "Удаление инлайн-сообщений включено"
+
+
+async def _time_always(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    await _set_delete_mode(callback, DeleteMode.ALWAYS)
+    await show_time_settings(callback.message, bot, state)
+
+
+async def _time_range(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    await _set_delete_mode(callback, DeleteMode.TIME_RANGE)
+    await render_menu(
+        callback.message,
+        bot,
+        state,
+        "⏰ <b>Установка времени удаления</b>\n\n"
+        "Введите время начала в формате <b>HH:MM</b>\n"
+        "Например: <code>22:00</code>",
+        BACK_TO_TIME_KEYBOARD,
+        SettingsState.time_range_set_start,
+    )
+
+
+async def _whitelist_add(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    await render_menu(
+        callback.message,
+        bot,
+        state,
+        "➕ <b>Добавление ботов в белый список</b>\n\n"
+        "Введите username ботов через пробел или с новой строки\n"
+        "Например:\n"
+        "<code>@LyBot @gif @music</code>\n\n"
+        "или:\n"
+        "<code>@LyBot\n@gif\n@music</code>",
+        BACK_TO_WHITELIST_KEYBOARD,
+        SettingsState.whitelist_add,
+    )
+
+
+async def _whitelist_remove(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    if not chat_settings.get_config(callback.message.chat.id).whitelist:
+        await render_menu(
+            callback.message,
+            bot,
+            state,
+            "Белый список пуст!",
+            BACK_TO_WHITELIST_KEYBOARD,
+        )
+        return None
 
-    if callback.data == "time_always":
-        config.time_range.mode = DeleteMode.ALWAYS
-        await show_time_settings(callback.message, bot, state)
+    await show_whitelist_remove_menu(callback.message, bot, state)
 
-    elif callback.data == "time_range":
-        config.time_range.mode = DeleteMode.TIME_RANGE
 
-        keyboard = types.InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    types.InlineKeyboardButton(
-                        text="◀️ Назад", callback_data="back_to_time"
-                    )
-                ]
-            ]
+async def _whitelist_drop(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    chat_id = callback.message.chat.id
+    config = chat_settings.get_config(chat_id)
+
+    if data.version != config.version & VERSION_MASK or not (
+        0 <= data.index < len(config.whitelist)
+    ):
+        await _whitelist_remove(callback, bot, state, data)
+        return "Список изменился, выберите бота ещё раз"
+
+    bot_to_remove = config.whitelist[data.index]
+    chat_settings.edit(chat_id).remove_from_whitelist(bot_to_remove)
+    chat_settings.mark_dirty(chat_id)
+    await show_whitelist_menu(callback.message, bot, state)
+    return f"Бот {bot_to_remove} удален из белого списка"
+
+
+async def _signature_add(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    await render_menu(
+        callback.message,
+        bot,
+        state,
+        "➕ <b>Добавление подписей</b>\n\n"
+        "Введите подписи, каждую с новой строки. Подпись — слова, которые "
+        "инлайн-бот ставит перед своим @username\n"
+        "Например:\n"
+        "<code>отправлено\nпри помощи</code>",
+        BACK_TO_SIGNATURES_KEYBOARD,
+        SettingsState.signature_add,
+    )
+
+
+async def _signature_remove(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    if not chat_settings.get_config(callback.message.chat.id).extra_signatures:
+        await render_menu(
+            callback.message,
+            bot,
+            state,
+            "Своих подписей нет!",
+            BACK_TO_SIGNATURES_KEYBOARD,
         )
+        return None
 
-        msg = await send_message_with_auto_delete(
-            bot=bot,
-            chat_id=chat_id,
-            text=(
-                "⏰ <b>Установка времени удаления</b>\n\n"
-                "Введите время начала в формате <b>HH:MM</b>\n"
-                "Например: <code>22:00</code>"
-            ),
-            config=config,
-            reply_markup=keyboard,
-        )
-        await state.set_state(SettingsState.time_range_set_start)
-        if msg:
-            await state.update_data(last_message_id=msg.message_id)
+    await show_signature_remove_menu(callback.message, bot, state)
 
 
-async def handle_whitelist_callback(
-    callback: CallbackQuery, bot: Bot, state: FSMContext
-):
-    """Обработчик callback'ов белого списка"""
+async def _signature_drop(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
     chat_id = callback.message.chat.id
-    config = chat_settings[chat_id]
-
-    await delete_message_silently(bot, chat_id, callback.message.message_id)
-
-    if callback.data == "whitelist_add":
-        keyboard = types.InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    types.InlineKeyboardButton(
-                        text="◀️ Назад", callback_data="back_to_whitelist"
-                    )
-                ]
-            ]
-        )
+    config = chat_settings.get_config(chat_id)
 
-        msg = await send_message_with_auto_delete(
-            bot=bot,
-            chat_id=chat_id,
-            text=(
-                "➕ <b>Добавление ботов в белый список</b>\n\n"
-                "Введите username ботов через пробел или с новой строки\n"
-                "Например:\n"
-                "<code>@LyBot @gif @music</code>\n\n"
-                "или:\n"
-                "<code>@LyBot\n@gif\n@music</code>"
-            ),
-            config=config,
-            reply_markup=keyboard,
-        )
-        await state.set_state(SettingsState.whitelist_add)
-        if msg:
-            await state.update_data(last_message_id=msg.message_id)
-
-    elif callback.data == "whitelist_remove":
-        if not config.whitelist:
-            keyboard = types.InlineKeyboardMarkup(
-                inline_keyboard=[
-                    [
-                        types.InlineKeyboardButton(
-                            text="◀️ Назад", callback_data="back_to_whitelist"
-                        )
-                    ]
-                ]
-            )
-
-            msg = await send_message_with_auto_delete(
-                bot=bot,
-                chat_id=chat_id,
-                text="Белый список пуст!",
-                config=config,
-                reply_markup=keyboard,
-            )
-            if msg:
-                await state.update_data(last_message_id=msg.message_id)
-            return
-
-        buttons = []
-        for bot_username in config.whitelist:
-            buttons.append(
-                [
-                    types.InlineKeyboardButton(
-                        text=f"❌ {bot_username}",
-                        callback_data=f"remove_{bot_username}",
-                    )
-                ]
-            )
-
-        buttons.append(
-            [
-                types.InlineKeyboardButton(
-                    text="◀️ Назад", callback_data="back_to_whitelist"
-                )
-            ]
-        )
+    if data.version != config.version & VERSION_MASK or not (
+        0 <= data.index < len(config.extra_signatures)
+    ):
+        await _signature_remove(callback, bot, state, data)
+        return "Список изменился, выберите подпись ещё раз"
 
-        keyboard = types.InlineKeyboardMarkup(inline_keyboard=buttons)
-
-        msg = await send_message_with_auto_delete(
-            bot=bot,
-            chat_id=chat_id,
-            text=(
-                "➖ <b>Удаление бота из белого списка</b>\n\n"
-                "Выберите бота для удаления:"
-            ),
-            config=config,
-            reply_markup=keyboard,
-        )
-        await state.set_state(SettingsState.whitelist_remove)
-        if msg:
-            await state.update_data(last_message_id=msg.message_id)
+    signature = config.extra_signatures[data.index]
+    chat_settings.edit(chat_id).remove_signature(signature)
+    chat_settings.mark_dirty(chat_id)
+    await show_signatures_menu(callback.message, bot, state)
+    return f"Подпись «{signature}» удалена"
 
 
-async def handle_auto_delete_callback(
-    callback: CallbackQuery, bot: Bot, state: FSMContext
-):
-    """Обработчик callback'ов автоудаления"""
+async def _auto_delete_toggle(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
     chat_id = callback.message.chat.id
-    config = chat_settings[chat_id]
-
-    await delete_message_silently(bot, chat_id, callback.message.message_id)
-
-    if callback.data == "autodel_toggle":
-        config.auto_delete.enabled = not config.auto_delete.enabled
-        await show_auto_delete_settings(callback.message, bot, state)
-
-    elif callback.data == "autodel_set_time":
-        keyboard = types.InlineKeyboardMarkup(
-            inline_keyboard=[
-                [
-                    types.InlineKeyboardButton(
-                        text="◀️ Назад", callback_data="back_to_auto_delete"
-                    )
-                ]
-            ]
-        )
-
-        msg = await send_message_with_auto_delete(
-            bot=bot,
-            chat_id=chat_id,
-            text=(
-                "⏱️ <b>Установка времени автоудаления</b>\n\n"
-                "Введите время в секундах (от 5 до 3600)\n"
-                "Например: <code>30</code> - удалить через 30 секунд"
-            ),
-            config=config,
-            reply_markup=keyboard,
-        )
-        await state.set_state(SettingsState.auto_delete_time_set)
-        if msg:
-            await state.update_data(last_message_id=msg.message_id)
+    config = chat_settings.edit(chat_id)
+    config.auto_delete.enabled = not config.auto_delete.enabled
+    chat_settings.mark_dirty(chat_id)
+    await show_auto_delete_settings(callback.message, bot, state)
+
+
+async def _auto_delete_time(
+    callback: CallbackQuery, bot: Bot, state: FSMContext, data: MenuCallback
+) -> Optional[str]:
+    await render_menu(
+        callback.message,
+        bot,
+        state,
+        "⏱️ <b>Установка времени автоудаления</b>\n\n"
+        "Введите время в секундах (от 5 до 3600)\n"
+        "Например: <code>30</code> - удалить через 30 секунд",
+        BACK_TO_AUTO_DELETE_KEYBOARD,
+        SettingsState.auto_delete_time_set,
+    )
+
+
+CALLBACK_ROUTES: Dict[MenuOp, CallbackRoute] = {
+    MenuOp.MAIN: _screen(show_settings_menu),
+    MenuOp.TIME: _screen(show_time_settings),
+    MenuOp.WHITELIST: _screen(show_whitelist_menu),
+    MenuOp.AUTO_DELETE: _screen(show_auto_delete_settings),
+    MenuOp.STATUS: _screen(show_status),
+    MenuOp.SIGNATURES: _screen(show_signatures_menu),
+    MenuOp.DELETE_ON: _delete_on,
+    MenuOp.DELETE_OFF: _delete_off,
+    MenuOp.TIME_ALWAYS: _time_always,
+    MenuOp.TIME_RANGE: _time_range,
+    MenuOp.WHITELIST_ADD: _whitelist_add,
+    MenuOp.WHITELIST_REMOVE: _whitelist_remove,
+    MenuOp.WHITELIST_DROP: _whitelist_drop,
+    MenuOp.SIGNATURE_ADD: _signature_add,
+    MenuOp.SIGNATURE_REMOVE: _signature_remove,
+    MenuOp.SIGNATURE_DROP: _signature_drop,
+    MenuOp.AUTO_DELETE_TOGGLE: _auto_delete_toggle,
+    MenuOp.AUTO_DELETE_TIME: _auto_delete_time,
+}
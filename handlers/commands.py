@@ -7,7 +7,6 @@ from aiogram.fsm.context import FSMContext
 from aiogram.enums import ChatMemberStatus
 
 from core.storage import chat_settings
-from domain.models import ChatConfig
 from utils.decorators import admin_required
 from utils.helpers import (
     delete_message_silently,
@@ -21,9 +20,7 @@ async def cmd_start(message: Message, bot: Bot):
     """Обработчик команды /start"""
     await delete_message_silently(bot, message.chat.id, message.message_id)
 
-    if message.chat.id not in chat_settings:
-        chat_settings[message.chat.id] = ChatConfig()
-    config = chat_settings[message.chat.id]
+    config = chat_settings.get_config(message.chat.id)
 
     if message.chat.type in ["group", "supergroup"]:
         try:
@@ -60,4 +57,9 @@ async def cmd_start(message: Message, bot: Bot):
 @admin_required
 async def cmd_settings(message: Message, bot: Bot, state: FSMContext):
     """Обработчик команды /settings"""
+    data = await state.get_data()
+    if data.get("last_message_id"):
+        await delete_message_silently(bot, message.chat.id, data["last_message_id"])
+        await state.update_data(last_message_id=None)
+
     await show_settings_menu(message, bot, state)
@@ -0,0 +1,24 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+from aiogram.types import ChatMemberUpdated
+
+from core.storage import admin_cache, admin_index, delete_breaker
+from utils.helpers import is_admin_status
+
+
+async def handle_chat_member(event: ChatMemberUpdated):
+    """Обновляет кэш прав при изменении статуса участника чата"""
+    chat_id = event.chat.id
+    user_id = event.new_chat_member.user.id
+    is_admin = is_admin_status(event.new_chat_member.status)
+
+    admin_index.update_member(chat_id, user_id, is_admin)
+    admin_cache.set(chat_id, user_id, is_admin)
+
+
+async def handle_my_chat_member(event: ChatMemberUpdated):
+    """Сбрасывает кэш прав и предохранитель удаления при изменении статуса самого бота"""
+    admin_index.invalidate(event.chat.id)
+    admin_cache.invalidate(event.chat.id)
+    delete_breaker.reset(event.chat.id)
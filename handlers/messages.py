@@ -7,7 +7,8 @@ from aiogram.fsm.context import FSMContext
 
 from core.storage import chat_settings
 from domain.states import SettingsState
-from domain.models import ChatConfig, DeleteMode
+from domain.detector import SIGNATURE_WINDOW
+from domain.models import DeleteMode, normalize_username
 from domain.services import check_and_handle_inline_bot
 from utils.decorators import admin_required
 from utils.helpers import delete_message_silently, send_message_with_auto_delete
@@ -17,14 +18,12 @@ from utils.helpers import delete_message_silently, send_message_with_auto_delete
 async def handle_text_input(message: Message, bot: Bot, state: FSMContext):
     """Обработчик текстового ввода для настроек"""
     chat_id = message.chat.id
-    if chat_id not in chat_settings:
-        chat_settings[chat_id] = ChatConfig()
-
-    config = chat_settings[chat_id]
+    config = chat_settings.get_config(chat_id)
     current_state = await state.get_state()
 
     input_states = [
         SettingsState.whitelist_add,
+        SettingsState.signature_add,
         SettingsState.auto_delete_time_set,
         SettingsState.time_range_set_start,
         SettingsState.time_range_set_end,
@@ -54,16 +53,21 @@ async def handle_text_input(message: Message, bot: Bot, state: FSMContext):
         already_exists = []
         invalid_format = []
 
+        if any(name.startswith("@") for name in usernames):
+            config = chat_settings.edit(chat_id)
+
         for bot_username in usernames:
-            if not bot_username.startswith("@"):
+            if not bot_username.startswith("@") or not normalize_username(bot_username):
                 invalid_format.append(bot_username)
                 continue
 
-            if config.is_whitelisted(bot_username):
-                already_exists.append(bot_username)
-            else:
-                config.whitelist.append(bot_username)
+            if config.add_to_whitelist(bot_username):
                 added_bots.append(bot_username)
+            else:
+                already_exists.append(bot_username)
+
+        if added_bots:
+            chat_settings.mark_dirty(chat_id)
 
         result_text = ""
         if added_bots:
@@ -84,11 +88,57 @@ async def handle_text_input(message: Message, bot: Bot, state: FSMContext):
 
         await show_whitelist_menu(message, bot, state)
 
+    elif current_state == SettingsState.signature_add:
+        signatures = [
+            " ".join(line.split()) for line in message.text.split("\n") if line.strip()
+        ]
+
+        if not signatures:
+            await send_message_with_auto_delete(
+                bot, chat_id, "❌ Введите подписи, каждую с новой строки", config
+            )
+            return
+
+        added = []
+        already_exists = []
+        invalid_format = []
+
+        config = chat_settings.edit(chat_id)
+        for signature in signatures:
+            if "@" in signature or len(signature) > SIGNATURE_WINDOW:
+                invalid_format.append(signature)
+            elif config.add_signature(signature):
+                added.append(signature)
+            else:
+                already_exists.append(signature)
+
+        if added:
+            chat_settings.mark_dirty(chat_id)
+
+        result_text = ""
+        if added:
+            result_text += f"✅ Добавлены подписи: {', '.join(added)}\n"
+        if already_exists:
+            result_text += f"ℹ️ Уже в списке: {', '.join(already_exists)}\n"
+        if invalid_format:
+            result_text += (
+                f"❌ Без @username и не длиннее {SIGNATURE_WINDOW} символов: "
+                f"{', '.join(invalid_format)}\n"
+            )
+
+        await send_message_with_auto_delete(bot, chat_id, result_text.strip(), config)
+
+        from handlers.settings_menu import show_signatures_menu
+
+        await show_signatures_menu(message, bot, state)
+
     elif current_state == SettingsState.auto_delete_time_set:
         try:
             seconds = int(message.text.strip())
             if 5 <= seconds <= 3600:
+                config = chat_settings.edit(chat_id)
                 config.auto_delete.delete_after = seconds
+                chat_settings.mark_dirty(chat_id)
                 await send_message_with_auto_delete(
                     bot,
                     chat_id,
@@ -112,36 +162,27 @@ async def handle_text_input(message: Message, bot: Bot, state: FSMContext):
             if ":" in message.text:
                 hours, minutes = map(int, message.text.strip().split(":"))
                 if 0 <= hours <= 23 and 0 <= minutes <= 59:
+                    config = chat_settings.edit(chat_id)
                     config.time_range.start_hour = hours
                     config.time_range.start_minute = minutes
+                    chat_settings.mark_dirty(chat_id)
 
-                    from aiogram import types
-
-                    keyboard = types.InlineKeyboardMarkup(
-                        inline_keyboard=[
-                            [
-                                types.InlineKeyboardButton(
-                                    text="◀️ Назад", callback_data="back_to_time"
-                                )
-                            ]
-                        ]
+                    from handlers.settings_menu import (
+                        BACK_TO_TIME_KEYBOARD,
+                        render_menu,
                     )
 
-                    msg = await send_message_with_auto_delete(
-                        bot=bot,
-                        chat_id=chat_id,
-                        text=(
-                            "⏰ <b>Установка времени удаления</b>\n\n"
-                            f"Время начала: <b>{hours:02d}:{minutes:02d}</b>\n\n"
-                            "Теперь введите время окончания в формате <b>HH:MM</b>\n"
-                            "Например: <code>08:00</code>"
-                        ),
-                        config=config,
-                        reply_markup=keyboard,
+                    await render_menu(
+                        message,
+                        bot,
+                        state,
+                        "⏰ <b>Установка времени удаления</b>\n\n"
+                        f"Время начала: <b>{hours:02d}:{minutes:02d}</b>\n\n"
+                        "Теперь введите время окончания в формате <b>HH:MM</b>\n"
+                        "Например: <code>08:00</code>",
+                        BACK_TO_TIME_KEYBOARD,
+                        SettingsState.time_range_set_end,
                     )
-                    await state.set_state(SettingsState.time_range_set_end)
-                    if msg:
-                        await state.update_data(last_message_id=msg.message_id)
                 else:
                     raise ValueError
             else:
@@ -159,10 +200,12 @@ async def handle_text_input(message: Message, bot: Bot, state: FSMContext):
             if ":" in message.text:
                 hours, minutes = map(int, message.text.strip().split(":"))
                 if 0 <= hours <= 23 and 0 <= minutes <= 59:
+                    config = chat_settings.edit(chat_id)
                     config.time_range.end_hour = hours
                     config.time_range.end_minute = minutes
 
                     config.time_range.mode = DeleteMode.TIME_RANGE
+                    chat_settings.mark_dirty(chat_id)
 
                     await send_message_with_auto_delete(
                         bot,
@@ -188,7 +231,7 @@ async def handle_text_input(message: Message, bot: Bot, state: FSMContext):
             )
 
 
-async def handle_all_messages(message: Message, bot: Bot, state: FSMContext):
+async def handle_all_messages(message: Message, bot: Bot):
     """Обработчик всех сообщений"""
     if message.text and message.text.startswith("/"):
         return
@@ -1,108 +1,99 @@
 # SPDX-License-Identifier: MIT
 # Copyright (C) 2026 CodWiz
 
+from typing import Tuple
+
 from aiogram import Bot
 from aiogram.types import Message
 from aiogram.fsm.context import FSMContext
 from aiogram import types
 
-from core.storage import chat_settings
+from core.cache import RenderCache
+from core.config import MENU_CACHE_MAX_SIZE
+from core.metrics import registry
+from core.storage import chat_settings, delete_breaker
+from domain.callbacks import MenuOp, menu_data
 from domain.states import SettingsState
-from domain.models import DeleteMode
-from domain.models import ChatConfig
-from utils.helpers import send_message_with_auto_delete, delete_message_silently
-
-
-async def show_settings_menu(message: Message, bot: Bot, state: FSMContext):
-    """Показывает главное меню настроек"""
-    chat_id = message.chat.id
-    if chat_id not in chat_settings:
-        chat_settings[chat_id] = ChatConfig()
+from domain.models import ChatConfig, DeleteMode
+from utils.helpers import edit_message_with_auto_delete
 
-    config = chat_settings[chat_id]
+MenuView = Tuple[str, types.InlineKeyboardMarkup]
 
-    is_disabled = config.time_range.mode == DeleteMode.DISABLED
-    toggle_text = "🔴 Включить удаление" if is_disabled else "🟢 Выключить удаление"
-    toggle_callback = "toggle_global_on" if is_disabled else "toggle_global_off"
 
-    keyboard = types.InlineKeyboardMarkup(
+def _keyboard(*rows: Tuple[str, str]) -> types.InlineKeyboardMarkup:
+    return types.InlineKeyboardMarkup(
         inline_keyboard=[
-            [
-                types.InlineKeyboardButton(
-                    text=toggle_text, callback_data=toggle_callback
-                )
-            ],
-            [
-                types.InlineKeyboardButton(
-                    text="⏰ Режим (Всегда/Таймер)", callback_data="settings_time"
-                )
-            ],
-            [
-                types.InlineKeyboardButton(
-                    text="📋 Белый список", callback_data="settings_whitelist"
-                )
-            ],
-            [
-                types.InlineKeyboardButton(
-                    text="🗑️ Автоудаление ответов бота",
-                    callback_data="settings_auto_delete",
-                )
-            ],
-            [
-                types.InlineKeyboardButton(
-                    text="📊 Статус", callback_data="settings_status"
-                )
-            ],
+            [types.InlineKeyboardButton(text=text, callback_data=data)]
+            for text, data in rows
         ]
     )
 
-    text = (
-        "⚙️ <b>Главное меню настроек</b>\n\n"
-        f"Текущие настройки:\n"
-        f"• Режим удаления: <b>{config.time_range}</b>\n"
-        f"• Белый список: <b>{len(config.whitelist)} ботов</b>\n"
-        f"• Автоудаление ответов: <b>{config.auto_delete}</b>"
+
+def _main_keyboard(is_disabled: bool) -> types.InlineKeyboardMarkup:
+    if is_disabled:
+        toggle = ("🔴 Включить удаление", menu_data(MenuOp.DELETE_ON))
+    else:
+        toggle = ("🟢 Выключить удаление", menu_data(MenuOp.DELETE_OFF))
+    return _keyboard(
+        toggle,
+        ("⏰ Режим (Всегда/Таймер)", menu_data(MenuOp.TIME)),
+        ("📋 Белый список", menu_data(MenuOp.WHITELIST)),
+        ("✍️ Подписи инлайн-ботов", menu_data(MenuOp.SIGNATURES)),
+        ("🗑️ Автоудаление ответов бота", menu_data(MenuOp.AUTO_DELETE)),
+        ("📊 Статус", menu_data(MenuOp.STATUS)),
     )
 
-    data = await state.get_data()
-    if "last_message_id" in data:
-        await delete_message_silently(bot, chat_id, data["last_message_id"])
 
-    msg = await send_message_with_auto_delete(
-        bot, chat_id, text, config, reply_markup=keyboard
+def _time_keyboard(mode: DeleteMode) -> types.InlineKeyboardMarkup:
+    status_icon = "✅" if mode == DeleteMode.TIME_RANGE else "⚪"
+    always_icon = "✅" if mode == DeleteMode.ALWAYS else "⚪"
+    return _keyboard(
+        (f"{always_icon} Всегда удалять", menu_data(MenuOp.TIME_ALWAYS)),
+        (f"{status_icon} По промежутку времени", menu_data(MenuOp.TIME_RANGE)),
+        ("◀️ Назад", menu_data(MenuOp.MAIN)),
     )
 
-    await state.set_state(SettingsState.main_menu)
-    if msg:
-        await state.update_data(last_message_id=msg.message_id)
 
+MAIN_KEYBOARDS = {
+    is_disabled: _main_keyboard(is_disabled) for is_disabled in (True, False)
+}
+TIME_KEYBOARDS = {mode: _time_keyboard(mode) for mode in DeleteMode}
+WHITELIST_KEYBOARD = _keyboard(
+    ("➕ Добавить бота/ботов", menu_data(MenuOp.WHITELIST_ADD)),
+    ("➖ Удалить бота", menu_data(MenuOp.WHITELIST_REMOVE)),
+    ("◀️ Назад", menu_data(MenuOp.MAIN)),
+)
+SIGNATURES_KEYBOARD = _keyboard(
+    ("➕ Добавить подпись", menu_data(MenuOp.SIGNATURE_ADD)),
+    ("➖ Удалить подпись", menu_data(MenuOp.SIGNATURE_REMOVE)),
+    ("◀️ Назад", menu_data(MenuOp.MAIN)),
+)
+BACK_TO_MAIN_KEYBOARD = _keyboard(("◀️ Назад", menu_data(MenuOp.MAIN)))
+BACK_TO_TIME_KEYBOARD = _keyboard(("◀️ Назад", menu_data(MenuOp.TIME)))
+BACK_TO_WHITELIST_KEYBOARD = _keyboard(("◀️ Назад", menu_data(MenuOp.WHITELIST)))
+BACK_TO_AUTO_DELETE_KEYBOARD = _keyboard(("◀️ Назад", menu_data(MenuOp.AUTO_DELETE)))
+BACK_TO_SIGNATURES_KEYBOARD = _keyboard(("◀️ Назад", menu_data(MenuOp.SIGNATURES)))
 
-async def show_time_settings(message: Message, bot: Bot, state: FSMContext):
-    """Показывает настройки времени"""
-    chat_id = message.chat.id
-    config = chat_settings[chat_id]
-    time_range = config.time_range
+menu_cache = RenderCache(max_size=MENU_CACHE_MAX_SIZE)
 
-    status_icon = "✅" if time_range.mode == DeleteMode.TIME_RANGE else "⚪"
-    always_icon = "✅" if time_range.mode == DeleteMode.ALWAYS else "⚪"
 
-    keyboard = types.InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                types.InlineKeyboardButton(
-                    text=f"{always_icon} Всегда удалять", callback_data="time_always"
-                )
-            ],
-            [
-                types.InlineKeyboardButton(
-                    text=f"{status_icon} По промежутку времени",
-                    callback_data="time_range",
-                )
-            ],
-            [types.InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_main")],
-        ]
+def _cached_view(menu: str, config: ChatConfig, build) -> MenuView:
+    return menu_cache.get_or_build((menu, config.version), lambda: build(config))
+
+
+def _main_view(config: ChatConfig) -> MenuView:
+    text = (
+        "⚙️ <b>Главное меню настроек</b>\n\n"
+        f"Текущие настройки:\n"
+        f"• Режим удаления: <b>{config.time_range}</b>\n"
+        f"• Белый список: <b>{len(config.whitelist)} ботов</b>\n"
+        f"• Автоудаление ответов: <b>{config.auto_delete}</b>"
     )
+    return text, MAIN_KEYBOARDS[config.time_range.mode == DeleteMode.DISABLED]
+
 
+def _time_view(config: ChatConfig) -> MenuView:
+    time_range = config.time_range
     text = (
         "⏰ <b>Настройка режима удаления</b>\n\n"
         f"Текущий режим: <b>{time_range}</b>\n"
@@ -110,79 +101,82 @@ async def show_time_settings(message: Message, bot: Bot, state: FSMContext):
         f"Конец: <b>{time_range.get_end_time().strftime('%H:%M')}</b>\n\n"
         "Выберите режим работы:"
     )
-
-    msg = await send_message_with_auto_delete(
-        bot, chat_id, text, config, reply_markup=keyboard
-    )
-    await state.set_state(SettingsState.time_settings)
-    if msg:
-        await state.update_data(last_message_id=msg.message_id)
+    return text, TIME_KEYBOARDS[time_range.mode]
 
 
-async def show_whitelist_menu(message: Message, bot: Bot, state: FSMContext):
-    """Показывает меню белого списка"""
-    chat_id = message.chat.id
-    config = chat_settings[chat_id]
-
+def _whitelist_view(config: ChatConfig) -> MenuView:
     whitelist_text = (
         "\n".join([f"• {bot}" for bot in config.whitelist])
         if config.whitelist
         else "Пусто"
     )
-
-    keyboard = types.InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                types.InlineKeyboardButton(
-                    text="➕ Добавить бота/ботов", callback_data="whitelist_add"
-                )
-            ],
-            [
-                types.InlineKeyboardButton(
-                    text="➖ Удалить бота", callback_data="whitelist_remove"
-                )
-            ],
-            [types.InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_main")],
-        ]
-    )
-
     text = (
         "📋 <b>Управление белым списком</b>\n\n"
         f"Текущий список ({len(config.whitelist)}):\n{whitelist_text}"
     )
+    return text, WHITELIST_KEYBOARD
+
+
+def _whitelist_remove_view(config: ChatConfig) -> MenuView:
+    keyboard = _keyboard(
+        *[
+            (
+                f"❌ {bot_username}",
+                menu_data(MenuOp.WHITELIST_DROP, index, config.version),
+            )
+            for index, bot_username in enumerate(config.whitelist)
+        ],
+        ("◀️ Назад", menu_data(MenuOp.WHITELIST)),
+    )
+    text = "➖ <b>Удаление бота из белого списка</b>\n\nВыберите бота для удаления:"
+    return text, keyboard
 
-    msg = await send_message_with_auto_delete(
-        bot, chat_id, text, config, reply_markup=keyboard
+
+def _signatures_view(config: ChatConfig) -> MenuView:
+    signatures_text = (
+        "\n".join([f"• {signature}" for signature in config.extra_signatures])
+        if config.extra_signatures
+        else "Нет"
     )
-    await state.set_state(SettingsState.whitelist_menu)
-    if msg:
-        await state.update_data(last_message_id=msg.message_id)
+    text = (
+        "✍️ <b>Подписи инлайн-ботов</b>\n\n"
+        "Кроме стандартных подписей (via, через, с помощью, with, by) "
+        "сообщение с inline-клавиатурой считается инлайн-сообщением, если "
+        "перед @username бота стоит одна из подписей чата.\n\n"
+        f"Подписи чата ({len(config.extra_signatures)}):\n{signatures_text}"
+    )
+    return text, SIGNATURES_KEYBOARD
+
+
+def _signature_remove_view(config: ChatConfig) -> MenuView:
+    keyboard = _keyboard(
+        *[
+            (
+                f"❌ {signature}",
+                menu_data(MenuOp.SIGNATURE_DROP, index, config.version),
+            )
+            for index, signature in enumerate(config.extra_signatures)
+        ],
+        ("◀️ Назад", menu_data(MenuOp.SIGNATURES)),
+    )
+    text = "➖ <b>Удаление подписи</b>\n\nВыберите подпись для удаления:"
+    return text, keyboard
 
 
-async def show_auto_delete_settings(message: Message, bot: Bot, state: FSMContext):
-    """Показывает настройки автоудаления"""
-    chat_id = message.chat.id
-    config = chat_settings[chat_id]
+def _auto_delete_view(config: ChatConfig) -> MenuView:
     auto_del = config.auto_delete
-
     status_icon = "✅" if auto_del.enabled else "⚪"
 
-    keyboard = types.InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                types.InlineKeyboardButton(
-                    text=f"{status_icon} {'Выключить' if auto_del.enabled else 'Включить'}",
-                    callback_data="autodel_toggle",
-                )
-            ],
-            [
-                types.InlineKeyboardButton(
-                    text=f"⏱️ Установить время ({auto_del.delete_after} сек)",
-                    callback_data="autodel_set_time",
-                )
-            ],
-            [types.InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_main")],
-        ]
+    keyboard = _keyboard(
+        (
+            f"{status_icon} {'Выключить' if auto_del.enabled else 'Включить'}",
+            menu_data(MenuOp.AUTO_DELETE_TOGGLE),
+        ),
+        (
+            f"⏱️ Установить время ({auto_del.delete_after} сек)",
+            menu_data(MenuOp.AUTO_DELETE_TIME),
+        ),
+        ("◀️ Назад", menu_data(MenuOp.MAIN)),
     )
 
     text = (
@@ -191,13 +185,91 @@ async def show_auto_delete_settings(message: Message, bot: Bot, state: FSMContex
         f"Время: <b>{auto_del.delete_after} секунд</b>\n\n"
         "Мои сообщения (меню, ответы) будут автоматически удаляться через указанное время, чтобы не засорять чат."
     )
+    return text, keyboard
+
+
+async def render_menu(
+    message: Message,
+    bot: Bot,
+    state: FSMContext,
+    text: str,
+    keyboard: types.InlineKeyboardMarkup,
+    next_state=None,
+):
+    """Выводит экран меню, редактируя текущее сообщение меню вместо отправки нового"""
+    chat_id = message.chat.id
+    config = chat_settings.get_config(chat_id)
+
+    if message.from_user is not None and message.from_user.id == bot.id:
+        target_id = message.message_id
+    else:
+        target_id = (await state.get_data()).get("last_message_id")
+
+    message_id = await edit_message_with_auto_delete(
+        bot, chat_id, target_id, text, config, reply_markup=keyboard
+    )
+
+    if next_state is not None:
+        await state.set_state(next_state)
+    if message_id:
+        await state.update_data(last_message_id=message_id)
+
+
+async def show_settings_menu(message: Message, bot: Bot, state: FSMContext):
+    """Показывает главное меню настроек"""
+    config = chat_settings.get_config(message.chat.id)
+    text, keyboard = _cached_view("main", config, _main_view)
+    await render_menu(message, bot, state, text, keyboard, SettingsState.main_menu)
+
+
+async def show_time_settings(message: Message, bot: Bot, state: FSMContext):
+    """Показывает настройки времени"""
+    config = chat_settings.get_config(message.chat.id)
+    text, keyboard = _cached_view("time", config, _time_view)
+    await render_menu(message, bot, state, text, keyboard, SettingsState.time_settings)
+
+
+async def show_whitelist_menu(message: Message, bot: Bot, state: FSMContext):
+    """Показывает меню белого списка"""
+    config = chat_settings.get_config(message.chat.id)
+    text, keyboard = _cached_view("whitelist", config, _whitelist_view)
+    await render_menu(message, bot, state, text, keyboard, SettingsState.whitelist_menu)
+
+
+async def show_whitelist_remove_menu(message: Message, bot: Bot, state: FSMContext):
+    """Показывает список ботов для удаления из белого списка"""
+    config = chat_settings.get_config(message.chat.id)
+    text, keyboard = _cached_view("whitelist_remove", config, _whitelist_remove_view)
+    await render_menu(
+        message, bot, state, text, keyboard, SettingsState.whitelist_remove
+    )
+
+
+async def show_signatures_menu(message: Message, bot: Bot, state: FSMContext):
+    """Показывает подписи инлайн-ботов чата"""
+    config = chat_settings.get_config(message.chat.id)
+    text, keyboard = _cached_view("signatures", config, _signatures_view)
+    await render_menu(
+        message, bot, state, text, keyboard, SettingsState.signatures_menu
+    )
+
 
-    msg = await send_message_with_auto_delete(
-        bot, chat_id, text, config, reply_markup=keyboard
+async def show_signature_remove_menu(message: Message, bot: Bot, state: FSMContext):
+    """Показывает список подписей для удаления"""
+    config = chat_settings.get_config(message.chat.id)
+    text, keyboard = _cached_view("signature_remove", config, _signature_remove_view)
+    await render_menu(
+        message, bot, state, text, keyboard, SettingsState.signature_remove
+    )
+
+
+async def show_auto_delete_settings(message: Message, bot: Bot, state: FSMContext):
+    """Показывает настройки автоудаления"""
+    config = chat_settings.get_config(message.chat.id)
+    text, keyboard = _cached_view("auto_delete", config, _auto_delete_view)
+    await render_menu(
+        message, bot, state, text, keyboard, SettingsState.auto_delete_settings
     )
-    await state.set_state(SettingsState.auto_delete_settings)
-    if msg:
-        await state.update_data(last_message_id=msg.message_id)
 
 
 async def show_status(message: Message, bot: Bot, state: FSMContext):
@@ -205,11 +277,12 @@ async def show_status(message: Message, bot: Bot, state: FSMContext):
     from datetime import datetime
 
     chat_id = message.chat.id
-    config = chat_settings[chat_id]
+    config = chat_settings.get_config(chat_id)
     time_range = config.time_range
 
     is_active_now = time_range.should_delete_at(None)
     current_time = datetime.now().strftime("%H:%M")
+    signatures = ", ".join(config.extra_signatures) or "только стандартные"
 
     status_text = (
         "📊 <b>Статус бота</b>\n\n"
@@ -222,20 +295,28 @@ async def show_status(message: Message, bot: Bot, state: FSMContext):
         f"<b>Белый список:</b>\n"
         f"• Ботов в списке: {len(config.whitelist)}\n"
         f"• Примеры: {', '.join(config.whitelist[:3]) if config.whitelist else 'нет'}\n\n"
+        f"<b>Подписи инлайн-ботов:</b> {signatures}\n\n"
         f"<b>Автоудаление моих ответов:</b>\n"
         f"• Статус: {'✅ Включено' if config.auto_delete.enabled else '❌ Выключено'}\n"
         f"• Время: {config.auto_delete.delete_after} секунд"
     )
 
-    keyboard = types.InlineKeyboardMarkup(
-        inline_keyboard=[
-            [types.InlineKeyboardButton(text="◀️ Назад", callback_data="back_to_main")]
-        ]
-    )
+    blocked_for = delete_breaker.blocked_for(chat_id)
+    if blocked_for:
+        status_text += (
+            "\n\n⚠️ <b>Нет прав на удаление сообщений</b>\n"
+            f"• Удаление приостановлено, повторная попытка через {int(blocked_for) + 1} сек.\n"
+            "• Выдайте боту право удалять сообщения"
+        )
 
-    msg = await send_message_with_auto_delete(
-        bot, chat_id, status_text, config, reply_markup=keyboard
+    await render_menu(
+        message, bot, state, status_text, BACK_TO_MAIN_KEYBOARD, SettingsState.main_menu
     )
-    await state.set_state(SettingsState.main_menu)
-    if msg:
-        await state.update_data(last_message_id=msg.message_id)
+
+
+registry.counter_callback(
+    "cleaner_menu_cache_lookups_total",
+    "Settings menu render cache lookups by result",
+    lambda: {("hit",): menu_cache.hits, ("miss",): menu_cache.misses},
+    ["result"],
+)
@@ -1,7 +1,16 @@
 # SPDX-License-Identifier: MIT
 # Copyright (C) 2026 CodWiz
 
+import argparse
+import asyncio
+
 from bot.bot import main
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--mode", choices=["polling", "webhook", "sharded"], default=None
+    )
+    args = parser.parse_args()
+
+    asyncio.run(main(args.mode))
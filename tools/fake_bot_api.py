@@ -0,0 +1,298 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+"""Локальная замена Telegram Bot API для нагрузочного тестирования.
+
+Сервер отвечает на методы, которые использует бот, генерирует входящие
+обновления для getUpdates, добавляет задержку и ответы 429 и записывает
+каждый вызов. Чтобы бот ходил в этот сервер, укажите в core/config.py
+API_BASE_URL = "http://127.0.0.1:8081".
+
+Запуск:
+    python -m tools.fake_bot_api --port 8081 --updates-per-second 500 \\
+        --latency-ms 30 --flood-rate 0.01 --record calls.jsonl
+Статистика вызовов: GET http://127.0.0.1:8081/_stats
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+from aiohttp import web
+
+BOT_ID = 123456
+ADMIN_ID = 1
+
+
+class FakeBotAPI:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        flood_rate: float = 0.0,
+        retry_after: int = 1,
+        updates_per_second: float = 0.0,
+        chats: int = 100,
+        inline_ratio: float = 0.2,
+        record_path: Optional[str] = None,
+    ):
+        self.latency = latency
+        self.jitter = jitter
+        self.flood_rate = flood_rate
+        self.retry_after = retry_after
+        self.updates_per_second = updates_per_second
+        self.chat_ids = [-1000000000000 - i for i in range(chats)]
+        self.inline_ratio = inline_ratio
+        self.calls: Counter = Counter()
+        self.flood_responses: Counter = Counter()
+        self.deleted_messages = 0
+        self.started = time.time()
+        self._updates: List[dict] = []
+        self._update_id = 0
+        self._message_id = 0
+        self._new_updates = asyncio.Event()
+        self._record = open(record_path, "a", encoding="utf-8") if record_path else None
+        self._generator: Optional[asyncio.Task] = None
+
+    def create_app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_route("*", "/bot{token}/{method}", self.handle)
+        app.router.add_get("/_stats", self.handle_stats)
+        app.on_startup.append(self._on_startup)
+        app.on_cleanup.append(self._on_cleanup)
+        return app
+
+    async def handle(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"]
+        params = await self._read_params(request)
+        self.calls[method] += 1
+        if self._record:
+            self._record.write(
+                json.dumps(
+                    {"ts": time.time(), "method": method, "params": params},
+                    default=str,
+                )
+                + "\n"
+            )
+
+        if self.latency or self.jitter:
+            await asyncio.sleep(self.latency + random.random() * self.jitter)
+
+        if method != "getUpdates" and random.random() < self.flood_rate:
+            self.flood_responses[method] += 1
+            return web.json_response(
+                {
+                    "ok": False,
+                    "error_code": 429,
+                    "description": f"Too Many Requests: retry after {self.retry_after}",
+                    "parameters": {"retry_after": self.retry_after},
+                },
+                status=429,
+            )
+
+        handler = getattr(self, f"api_{method}", None)
+        result = await handler(params) if handler else True
+        return web.json_response({"ok": True, "result": result})
+
+    async def handle_stats(self, request: web.Request) -> web.Response:
+        elapsed = time.time() - self.started
+        return web.json_response(
+            {
+                "elapsed": elapsed,
+                "calls": dict(self.calls),
+                "calls_per_second": sum(self.calls.values()) / max(elapsed, 1e-9),
+                "flood_responses": dict(self.flood_responses),
+                "deleted_messages": self.deleted_messages,
+                "generated_updates": self._update_id,
+                "pending_updates": len(self._updates),
+            }
+        )
+
+    async def api_getMe(self, params: Dict[str, Any]) -> dict:
+        return {
+            "id": BOT_ID,
+            "is_bot": True,
+            "first_name": "cleaner",
+            "username": "cleaner_bot",
+        }
+
+    async def api_getUpdates(self, params: Dict[str, Any]) -> List[dict]:
+        offset = int(params.get("offset") or 0)
+        limit = int(params.get("limit") or 100)
+        timeout = min(float(params.get("timeout") or 0), 1.0)
+
+        self._updates = [u for u in self._updates if u["update_id"] >= offset]
+        if not self._updates and timeout:
+            self._new_updates.clear()
+            try:
+                await asyncio.wait_for(self._new_updates.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self._updates[:limit]
+
+    async def api_deleteMessage(self, params: Dict[str, Any]) -> bool:
+        self.deleted_messages += 1
+        return True
+
+    async def api_deleteMessages(self, params: Dict[str, Any]) -> bool:
+        self.deleted_messages += len(params.get("message_ids") or [])
+        return True
+
+    async def api_sendMessage(self, params: Dict[str, Any]) -> dict:
+        return self._message(
+            int(params["chat_id"]), BOT_ID, text=params.get("text", "")
+        )
+
+    async def api_editMessageText(self, params: Dict[str, Any]) -> dict:
+        message = self._message(
+            int(params["chat_id"]), BOT_ID, text=params.get("text", "")
+        )
+        message["message_id"] = int(params.get("message_id") or message["message_id"])
+        return message
+
+    async def api_getChatMember(self, params: Dict[str, Any]) -> dict:
+        user_id = int(params["user_id"])
+        status = "creator" if user_id == ADMIN_ID else "member"
+        if user_id == BOT_ID:
+            status = "administrator"
+        member = {"status": status, "user": self._user(user_id)}
+        if status == "creator":
+            member["is_anonymous"] = False
+        elif status == "administrator":
+            member.update(self._admin_rights())
+        return member
+
+    async def api_getChatAdministrators(self, params: Dict[str, Any]) -> List[dict]:
+        return [
+            {"status": "creator", "user": self._user(ADMIN_ID), "is_anonymous": False},
+            {
+                "status": "administrator",
+                "user": self._user(BOT_ID, is_bot=True),
+                **self._admin_rights(),
+            },
+        ]
+
+    def add_update(self, update: dict):
+        self._update_id += 1
+        update["update_id"] = self._update_id
+        self._updates.append(update)
+        self._new_updates.set()
+
+    def synthetic_update(self) -> dict:
+        chat_id = random.choice(self.chat_ids)
+        if random.random() < self.inline_ratio:
+            message = self._message(
+                chat_id,
+                random.randint(2, 10000),
+                text="inline result",
+                via_bot=self._user(777, is_bot=True, username="SpamInlineBot"),
+            )
+        else:
+            message = self._message(chat_id, random.randint(2, 10000), text="hello")
+        return {"message": message}
+
+    async def _generate_updates(self):
+        interval = 0.01
+        per_tick = self.updates_per_second * interval
+        carry = 0.0
+        while True:
+            carry += per_tick
+            while carry >= 1:
+                self.add_update(self.synthetic_update())
+                carry -= 1
+            await asyncio.sleep(interval)
+
+    def _message(self, chat_id: int, user_id: int, **extra) -> dict:
+        self._message_id += 1
+        message = {
+            "message_id": self._message_id,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "supergroup", "title": "load test"},
+            "from": self._user(user_id, is_bot=user_id == BOT_ID),
+        }
+        message.update(extra)
+        return message
+
+    @staticmethod
+    def _user(
+        user_id: int, is_bot: bool = False, username: Optional[str] = None
+    ) -> dict:
+        user = {"id": user_id, "is_bot": is_bot, "first_name": f"user{user_id}"}
+        if username:
+            user["username"] = username
+        return user
+
+    @staticmethod
+    def _admin_rights() -> dict:
+        rights = (
+            "can_manage_chat can_delete_messages can_manage_video_chats "
+            "can_restrict_members can_promote_members can_change_info "
+            "can_invite_users can_post_stories can_edit_stories "
+            "can_delete_stories can_manage_tags can_send_welcome_messages"
+        )
+        return {
+            "can_be_edited": False,
+            "is_anonymous": False,
+            **dict.fromkeys(rights.split(), True),
+        }
+
+    @staticmethod
+    async def _read_params(request: web.Request) -> Dict[str, Any]:
+        if request.content_type == "application/json":
+            return await request.json()
+
+        params = {}
+        for key, value in (await request.post()).items():
+            if isinstance(value, str):
+                try:
+                    value = json.loads(value)
+                except ValueError:
+                    pass
+            params[key] = value
+        params.update(request.query)
+        return params
+
+    async def _on_startup(self, app: web.Application):
+        if self.updates_per_second:
+            self._generator = asyncio.create_task(self._generate_updates())
+
+    async def _on_cleanup(self, app: web.Application):
+        if self._generator is not None:
+            self._generator.cancel()
+        if self._record:
+            self._record.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--flood-rate", type=float, default=0, help="доля ответов 429")
+    parser.add_argument("--retry-after", type=int, default=1)
+    parser.add_argument("--updates-per-second", type=float, default=0)
+    parser.add_argument("--chats", type=int, default=100)
+    parser.add_argument("--inline-ratio", type=float, default=0.2)
+    parser.add_argument("--record", help="файл JSONL для записи всех вызовов")
+    args = parser.parse_args()
+
+    api = FakeBotAPI(
+        latency=args.latency_ms / 1000,
+        jitter=args.jitter_ms / 1000,
+        flood_rate=args.flood_rate,
+        retry_after=args.retry_after,
+        updates_per_second=args.updates_per_second,
+        chats=args.chats,
+        inline_ratio=args.inline_ratio,
+        record_path=args.record,
+    )
+    web.run_app(api.create_app(), host=args.host, port=args.port, access_log=None)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+"""Локальная проверка шардированного режима на синтетических обновлениях.
+
+Запускает ShardRouter с настоящим циклом воркера (worker_main), но с
+диспетчером, который только записывает полученные сообщения. Проверяет,
+что каждый чат обслуживается одним шардом и порядок сообщений в чате
+сохраняется, и выводит пропускную способность.
+
+Запуск: python -m tools.shard_harness --shards 4 --chats 200 --updates 20000
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import random
+import time
+from collections import defaultdict
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Message
+
+from bot.sharding import ShardRouter, worker_main
+
+HARNESS_TOKEN = "123456:harness"
+
+
+def make_update(update_id: int, chat_id: int, seq: int) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": seq,
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "supergroup"},
+            "from": {"id": 1, "is_bot": False, "first_name": "user"},
+            "text": f"synthetic {seq}",
+        },
+    }
+
+
+def recording_worker(
+    shard_id: int,
+    queue: multiprocessing.Queue,
+    results: multiprocessing.Queue,
+    jitter: float,
+):
+    logging.getLogger("aiogram.event").setLevel(logging.WARNING)
+    dp = Dispatcher()
+
+    @dp.message()
+    async def record(message: Message):
+        if jitter:
+            await asyncio.sleep(random.random() * jitter)
+        results.put((shard_id, message.chat.id, message.message_id))
+
+    asyncio.run(worker_main(shard_id, queue, Bot(token=HARNESS_TOKEN), dp))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--chats", type=int, default=200)
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--jitter", type=float, default=0.001)
+    args = parser.parse_args()
+
+    results = multiprocessing.get_context("spawn").Queue()
+    router = ShardRouter(
+        args.shards, target=recording_worker, args=(results, args.jitter)
+    )
+    router.start()
+
+    chat_ids = [-1000000000000 - i for i in range(args.chats)]
+    next_seq = defaultdict(int)
+
+    started = time.perf_counter()
+    for update_id in range(args.updates):
+        chat_id = random.choice(chat_ids)
+        next_seq[chat_id] += 1
+        router.route(make_update(update_id, chat_id, next_seq[chat_id]))
+
+    received = defaultdict(list)
+    shards_by_chat = defaultdict(set)
+    for _ in range(args.updates):
+        shard_id, chat_id, seq = results.get(timeout=60)
+        received[chat_id].append(seq)
+        shards_by_chat[chat_id].add(shard_id)
+    elapsed = time.perf_counter() - started
+    router.stop()
+
+    out_of_order = [c for c, seqs in received.items() if seqs != sorted(seqs)]
+    split_chats = [c for c, shards in shards_by_chat.items() if len(shards) > 1]
+
+    print(f"shards={args.shards} chats={args.chats} updates={args.updates}")
+    print(f"routed per shard: {router.routed}")
+    print(f"throughput: {args.updates / elapsed:.0f} updates/s")
+    print(f"chats out of order: {len(out_of_order)}")
+    print(f"chats split across shards: {len(split_chats)}")
+    if out_of_order or split_chats:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import asyncio
+import time
+from typing import Dict, List, Set
+
+from aiogram import Bot
+
+from core.config import DELETE_BATCH_WINDOW, DELETE_BATCH_MAX_SIZE, logger
+from core.metrics import deletions, registry
+from core.storage import delete_breaker
+from utils.helpers import delete_message_silently
+
+batch_sizes = registry.histogram(
+    "cleaner_delete_batch_size",
+    "Number of message ids per deletion batch",
+    buckets=(1, 2, 5, 10, 25, 50, 100),
+)
+flush_latency = registry.histogram(
+    "cleaner_delete_flush_latency_seconds",
+    "Time from the first queued id to the end of its chat's flush",
+)
+
+
+class BatchDeleter:
+    """Накопительная очередь удаления, отправляющая id пачками через deleteMessages"""
+
+    def __init__(self, window: float, max_batch_size: int):
+        self.window = window
+        self.max_batch_size = max_batch_size
+        self.flushes = 0
+        self.batches = 0
+        self.deleted_in_batches = 0
+        self.max_batch_seen = 0
+        self.fallbacks = 0
+        self.flush_latency_total = 0.0
+        self._queues: Dict[int, List[int]] = {}
+        self._guarded: Dict[int, Set[int]] = {}
+        self._bots: Dict[int, Bot] = {}
+        self._first_enqueued: Dict[int, float] = {}
+        self._timers: Dict[int, asyncio.TimerHandle] = {}
+        self._tasks: Set[asyncio.Task] = set()
+
+    def enqueue(self, bot: Bot, chat_id: int, message_id: int, guarded: bool = False):
+        """Ставит id в очередь чата; guarded - удаление под предохранителем прав"""
+        queue = self._queues.get(chat_id)
+        if queue is None:
+            queue = self._queues[chat_id] = []
+            self._bots[chat_id] = bot
+            self._first_enqueued[chat_id] = time.monotonic()
+            loop = asyncio.get_running_loop()
+            self._timers[chat_id] = loop.call_later(
+                self.window, self._start_flush, chat_id
+            )
+
+        queue.append(message_id)
+        if guarded:
+            self._guarded.setdefault(chat_id, set()).add(message_id)
+        if len(queue) >= self.max_batch_size:
+            self._start_flush(chat_id)
+
+    def pending(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    async def flush(self, chat_id: int):
+        timer = self._timers.pop(chat_id, None)
+        if timer is not None:
+            timer.cancel()
+
+        message_ids = self._queues.pop(chat_id, None)
+        bot = self._bots.pop(chat_id, None)
+        enqueued_at = self._first_enqueued.pop(chat_id, time.monotonic())
+        guarded = self._guarded.pop(chat_id, set())
+        if not message_ids or bot is None:
+            return
+        if guarded and not delete_breaker.allow(chat_id):
+            deletions.inc(len(guarded), result="skipped")
+            message_ids = [m for m in message_ids if m not in guarded]
+            guarded = set()
+
+        unique_ids = list(dict.fromkeys(message_ids))
+        for start in range(0, len(unique_ids), self.max_batch_size):
+            await self._delete_batch(
+                bot, chat_id, unique_ids[start : start + self.max_batch_size], guarded
+            )
+
+        latency = time.monotonic() - enqueued_at
+        self.flushes += 1
+        self.flush_latency_total += latency
+        flush_latency.observe(latency)
+
+    async def flush_all(self):
+        for chat_id in list(self._queues):
+            await self.flush(chat_id)
+        if self._tasks:
+            await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "flushes": self.flushes,
+            "batches": self.batches,
+            "deleted_in_batches": self.deleted_in_batches,
+            "max_batch_size": self.max_batch_seen,
+            "fallbacks": self.fallbacks,
+            "flush_latency_total": self.flush_latency_total,
+            "pending": self.pending(),
+        }
+
+    def _start_flush(self, chat_id: int):
+        task = asyncio.create_task(self.flush(chat_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _delete_batch(
+        self, bot: Bot, chat_id: int, message_ids: List[int], guarded: Set[int]
+    ):
+        self.batches += 1
+        self.max_batch_seen = max(self.max_batch_seen, len(message_ids))
+        batch_sizes.observe(len(message_ids))
+
+        if len(message_ids) == 1:
+            message_id = message_ids[0]
+            if await delete_message_silently(
+                bot, chat_id, message_id, guarded=message_id in guarded
+            ):
+                self.deleted_in_batches += 1
+            return
+
+        try:
+            await bot.delete_messages(chat_id, message_ids)
+            self.deleted_in_batches += len(message_ids)
+            deletions.inc(len(message_ids), result="success")
+            if not guarded.isdisjoint(message_ids):
+                delete_breaker.record_success(chat_id)
+            return
+        except Exception as e:
+            logger.warning(
+                f"deleteMessages failed for {len(message_ids)} messages, "
+                f"falling back to single deletes: {e}"
+            )
+
+        self.fallbacks += 1
+        for message_id in message_ids:
+            await delete_message_silently(
+                bot, chat_id, message_id, guarded=message_id in guarded
+            )
+
+
+batch_deleter = BatchDeleter(
+    window=DELETE_BATCH_WINDOW, max_batch_size=DELETE_BATCH_MAX_SIZE
+)
+
+registry.gauge_callback(
+    "cleaner_delete_queue_pending",
+    "Message ids waiting in the batch deletion queue",
+    lambda: {(): batch_deleter.pending()},
+)
@@ -11,32 +11,28 @@ def admin_required(func):
 
     @wraps(func)
     async def wrapper(*args, **kwargs):
-        if len(args) > 0:
-            if isinstance(args[0], Message):
-                message = args[0]
-                bot = kwargs.get("bot") or args[1] if len(args) > 1 else None
-                kwargs.get("state")
-            elif isinstance(args[0], CallbackQuery):
-                callback = args[0]
-                message = callback.message
-                bot = kwargs.get("bot") or args[1] if len(args) > 1 else None
-                kwargs.get("state")
+        if not args or not isinstance(args[0], (Message, CallbackQuery)):
+            return await func(*args, **kwargs)
+
+        event = args[0]
+        bot = kwargs.get("bot") or (args[1] if len(args) > 1 else None)
+        if not bot:
+            return
+
+        if isinstance(event, CallbackQuery):
+            chat_id = event.message.chat.id
+        else:
+            chat_id = event.chat.id
+        user = event.from_user
+
+        if user is None or not await is_admin(bot, chat_id, user.id):
+            if isinstance(event, Message):
+                await delete_message_silently(bot, chat_id, event.message_id)
             else:
-                return await func(*args, **kwargs)
-
-            if not bot:
-                return
-
-            if not await is_admin(bot, message.chat.id, message.from_user.id):
-                if isinstance(args[0], Message):
-                    await delete_message_silently(
-                        bot, message.chat.id, message.message_id
-                    )
-                elif isinstance(args[0], CallbackQuery):
-                    await callback.answer(
-                        "Эта кнопка доступна только администраторам!", show_alert=True
-                    )
-                return
+                await event.answer(
+                    "Эта кнопка доступна только администраторам!", show_alert=True
+                )
+            return
 
         return await func(*args, **kwargs)
 
@@ -2,60 +2,139 @@
 # Copyright (C) 2026 CodWiz
 
 import asyncio
-from typing import Optional
+from typing import Dict, Optional, Set
 
 from aiogram import Bot
-from aiogram.exceptions import TelegramBadRequest
+from aiogram.exceptions import TelegramBadRequest, TelegramRetryAfter
 from aiogram.types import Message
 from aiogram.enums import ChatMemberStatus
 
 from core.config import logger
-from core.storage import chat_settings
+from core.metrics import deletions
+from core.storage import admin_cache, admin_index, delete_breaker
 from domain.models import ChatConfig
 
 
-async def delete_message_silently(bot: Bot, chat_id: int, message_id: int) -> bool:
-    """Безопасно удаляет сообщение с обработкой ошибок"""
+async def delete_message_silently(
+    bot: Bot, chat_id: int, message_id: int, guarded: bool = False
+) -> bool:
+    """Безопасно удаляет сообщение с обработкой ошибок.
+
+    guarded - удаление чужого сообщения, которое проходит через предохранитель
+    прав: свои сообщения бот удаляет и без прав, их отказы не учитываются.
+    """
+    if guarded and not delete_breaker.allow(chat_id):
+        deletions.inc(result="skipped")
+        return False
+
     try:
         await bot.delete_message(chat_id, message_id)
+        deletions.inc(result="success")
+        if guarded:
+            delete_breaker.record_success(chat_id)
         return True
     except TelegramBadRequest as e:
         error_text = str(e).lower()
         if "message to delete not found" in error_text:
+            deletions.inc(result="not_found")
             logger.warning(f"Message {message_id} already deleted or not found.")
         elif "message can't be deleted" in error_text:
+            deletions.inc(result="no_rights")
+            if guarded:
+                delete_breaker.record_failure(chat_id)
             logger.warning(f"Bot lacks permissions to delete message {message_id}.")
         else:
+            deletions.inc(result="bad_request")
             logger.error(f"TelegramBadRequest deleting message: {e}")
         return False
+    except TelegramRetryAfter as e:
+        deletions.inc(result="flood_limit")
+        logger.error(f"Flood limit persisted while deleting message {message_id}: {e}")
+        return False
     except Exception as e:
+        deletions.inc(result="error")
         logger.error(f"Unexpected error deleting message {message_id}: {e}")
         return False
 
 
-async def is_admin(bot: Bot, chat_id: int, user_id: int) -> bool:
-    """Проверяет, является ли пользователь администратором чата"""
+async def is_admin(
+    bot: Bot, chat_id: int, user_id: int, cache_checked: bool = False
+) -> bool:
+    """Проверяет, является ли пользователь администратором чата.
+
+    cache_checked - кэши уже проверены через peek_is_admin и промахнулись,
+    повторно их не читаем, чтобы не считать промах дважды.
+    """
+    admin_ids = await get_chat_admin_ids(bot, chat_id, cache_checked)
+    if admin_ids is not None:
+        return user_id in admin_ids
+
+    if not cache_checked:
+        cached = admin_cache.get(chat_id, user_id)
+        if cached is not None:
+            return cached
+
     try:
         member = await bot.get_chat_member(chat_id, user_id)
-        return member.status in [
-            ChatMemberStatus.ADMINISTRATOR,
-            ChatMemberStatus.CREATOR,
-        ]
     except Exception as e:
         logger.error(f"Error checking admin status: {e}")
         return False
 
+    result = is_admin_status(member.status)
+    admin_cache.set(chat_id, user_id, result)
+    return result
+
+
+def peek_is_admin(chat_id: int, user_id: int) -> Optional[bool]:
+    """Возвращает статус администратора из кэша без обращения к API"""
+    admin_ids = admin_index.get(chat_id)
+    if admin_ids is not None:
+        return user_id in admin_ids
+    return admin_cache.get(chat_id, user_id)
+
+
+_admin_fetches: Dict[int, asyncio.Task] = {}
+
+
+async def get_chat_admin_ids(
+    bot: Bot, chat_id: int, cache_checked: bool = False
+) -> Optional[Set[int]]:
+    """Возвращает множество id администраторов группы (с кэшированием)"""
+    if chat_id > 0:
+        return None
+
+    if not cache_checked:
+        admin_ids = admin_index.get(chat_id)
+        if admin_ids is not None:
+            return admin_ids
+
+    task = _admin_fetches.get(chat_id)
+    if task is None:
+        task = asyncio.create_task(_fetch_chat_admin_ids(bot, chat_id))
+        _admin_fetches[chat_id] = task
+        task.add_done_callback(lambda _: _admin_fetches.pop(chat_id, None))
 
-async def schedule_auto_delete(bot: Bot, chat_id: int, message_id: int, delay: int):
-    """Планирует автоматическое удаление сообщения"""
-    await asyncio.sleep(delay)
+    return await asyncio.shield(task)
 
-    if chat_id in chat_settings:
-        config = chat_settings[chat_id]
-        if message_id in config.message_tasks:
-            await delete_message_silently(bot, chat_id, message_id)
-            if message_id in config.message_tasks:
-                del config.message_tasks[message_id]
+
+async def _fetch_chat_admin_ids(bot: Bot, chat_id: int) -> Optional[Set[int]]:
+    try:
+        admins = await bot.get_chat_administrators(chat_id)
+    except Exception as e:
+        logger.error(f"Error fetching chat administrators: {e}")
+        return None
+
+    admin_ids = {member.user.id for member in admins}
+    admin_index.set(chat_id, admin_ids)
+    return admin_ids
+
+
+def is_admin_status(status: str) -> bool:
+    """Проверяет, соответствует ли статус участника правам администратора"""
+    return status in [
+        ChatMemberStatus.ADMINISTRATOR,
+        ChatMemberStatus.CREATOR,
+    ]
 
 
 async def send_message_with_auto_delete(
@@ -68,14 +147,56 @@ async def send_message_with_auto_delete(
         )
 
         if config.auto_delete.enabled and config.auto_delete.delete_after > 0:
-            task = asyncio.create_task(
-                schedule_auto_delete(
-                    bot, chat_id, message.message_id, config.auto_delete.delete_after
-                )
+            from utils.scheduler import auto_delete_scheduler
+
+            auto_delete_scheduler.schedule(
+                bot, chat_id, message.message_id, config.auto_delete.delete_after
             )
-            config.message_tasks[message.message_id] = task
 
         return message
     except Exception as e:
         logger.error(f"Error sending message: {e}")
         return None
+
+
+async def edit_message_with_auto_delete(
+    bot: Bot,
+    chat_id: int,
+    message_id: Optional[int],
+    text: str,
+    config: ChatConfig,
+    reply_markup=None,
+) -> Optional[int]:
+    """Редактирует сообщение бота на месте, при невозможности отправляет новое"""
+    from utils.scheduler import auto_delete_scheduler
+
+    if message_id is not None:
+        try:
+            await bot.edit_message_text(
+                text=text,
+                chat_id=chat_id,
+                message_id=message_id,
+                reply_markup=reply_markup,
+                parse_mode="HTML",
+            )
+        except TelegramBadRequest as e:
+            if "message is not modified" not in str(e).lower():
+                logger.warning(f"Can't edit message {message_id}, sending new: {e}")
+                message_id = None
+        except Exception as e:
+            logger.error(f"Error editing message: {e}")
+            message_id = None
+
+        if message_id is not None:
+            if config.auto_delete.enabled and config.auto_delete.delete_after > 0:
+                auto_delete_scheduler.schedule(
+                    bot, chat_id, message_id, config.auto_delete.delete_after
+                )
+            else:
+                auto_delete_scheduler.cancel(chat_id, message_id)
+            return message_id
+
+    message = await send_message_with_auto_delete(
+        bot, chat_id, text, config, reply_markup=reply_markup
+    )
+    return message.message_id if message else None
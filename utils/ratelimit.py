@@ -0,0 +1,219 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections import OrderedDict
+from enum import IntEnum
+from typing import Dict, List, Optional, Tuple
+
+from aiogram import Bot
+from aiogram.client.session.middlewares.base import (
+    BaseRequestMiddleware,
+    NextRequestMiddlewareType,
+)
+from aiogram.exceptions import TelegramRetryAfter
+from aiogram.methods import (
+    AnswerCallbackQuery,
+    DeleteMessage,
+    DeleteMessages,
+    DeleteWebhook,
+    EditMessageReplyMarkup,
+    EditMessageText,
+    GetChatAdministrators,
+    GetChatMember,
+    GetMe,
+    GetUpdates,
+    SendMessage,
+    SetWebhook,
+)
+from aiogram.methods.base import Response, TelegramMethod, TelegramType
+
+from core.config import (
+    RATE_LIMIT_GLOBAL_PER_SECOND,
+    RATE_LIMIT_CHAT_PER_MINUTE,
+    RATE_LIMIT_MAX_RETRIES,
+    RATE_LIMIT_MAX_CHAT_BUCKETS,
+    logger,
+)
+
+
+class Priority(IntEnum):
+    DELETE = 0
+    QUERY = 1
+    MENU = 2
+
+
+METHOD_PRIORITIES = {
+    DeleteMessage: Priority.DELETE,
+    DeleteMessages: Priority.DELETE,
+    GetChatMember: Priority.QUERY,
+    GetChatAdministrators: Priority.QUERY,
+    AnswerCallbackQuery: Priority.QUERY,
+}
+
+UNLIMITED_METHODS = (GetUpdates, GetMe, SetWebhook, DeleteWebhook)
+
+CHAT_LIMITED_METHODS = (SendMessage, EditMessageText, EditMessageReplyMarkup)
+
+
+class TokenBucket:
+    """Корзина токенов с очередью ожидающих по приоритету"""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._counter = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def acquire(self, priority: int = Priority.MENU):
+        if not self._waiters and self._try_take(time.monotonic()):
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._counter), future))
+        self._schedule()
+        await future
+
+    def pause(self, seconds: float):
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+        # Токены начинают копиться только после паузы, иначе по её окончании
+        # корзина оказалась бы полной и пропустила бы всплеск запросов
+        self._tokens = 0.0
+        self._updated = self._blocked_until
+
+    def is_idle(self) -> bool:
+        self._refill(time.monotonic())
+        return not self._waiters and self._tokens >= self.capacity
+
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+
+    def _try_take(self, now: float) -> bool:
+        if now < self._blocked_until:
+            return False
+        self._refill(now)
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _schedule(self):
+        if self._timer is not None:
+            return
+        now = time.monotonic()
+        self._refill(now)
+        delay = max(self._updated - now, 0.0) + max((1 - self._tokens) / self.rate, 0.0)
+        self._timer = asyncio.get_running_loop().call_later(delay, self._release)
+
+    def _release(self):
+        self._timer = None
+        now = time.monotonic()
+        while self._waiters:
+            future = self._waiters[0][2]
+            if future.done():
+                heapq.heappop(self._waiters)
+                continue
+            if not self._try_take(now):
+                break
+            heapq.heappop(self._waiters)
+            future.set_result(None)
+
+        if self._waiters:
+            self._schedule()
+
+
+class RateLimitMiddleware(BaseRequestMiddleware):
+    """Ограничение исходящих запросов к Bot API.
+
+    Все запросы проходят через общую корзину, а отправка и редактирование
+    сообщений — ещё и через корзину конкретного чата. Удаления обслуживаются
+    раньше меню. При TelegramRetryAfter корзина приостанавливается на
+    указанное время, и запрос повторяется.
+    """
+
+    def __init__(
+        self,
+        global_per_second: float = RATE_LIMIT_GLOBAL_PER_SECOND,
+        chat_per_minute: float = RATE_LIMIT_CHAT_PER_MINUTE,
+        max_retries: int = RATE_LIMIT_MAX_RETRIES,
+        max_chat_buckets: int = RATE_LIMIT_MAX_CHAT_BUCKETS,
+    ):
+        self.global_bucket = TokenBucket(global_per_second, global_per_second)
+        self.chat_per_minute = chat_per_minute
+        self.max_retries = max_retries
+        self.max_chat_buckets = max_chat_buckets
+        self.retry_after_count = 0
+        self._chat_buckets: "OrderedDict[int, TokenBucket]" = OrderedDict()
+
+    async def __call__(
+        self,
+        make_request: NextRequestMiddlewareType[TelegramType],
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+    ) -> Response[TelegramType]:
+        if isinstance(method, UNLIMITED_METHODS):
+            return await make_request(bot, method)
+
+        priority = METHOD_PRIORITIES.get(type(method), Priority.MENU)
+        chat_bucket = None
+        if isinstance(method, CHAT_LIMITED_METHODS) and isinstance(method.chat_id, int):
+            chat_bucket = self._chat_bucket(method.chat_id)
+
+        attempt = 0
+        while True:
+            if chat_bucket is not None:
+                await chat_bucket.acquire(priority)
+            await self.global_bucket.acquire(priority)
+
+            try:
+                return await make_request(bot, method)
+            except TelegramRetryAfter as e:
+                attempt += 1
+                self.retry_after_count += 1
+                if attempt > self.max_retries:
+                    raise
+
+                logger.warning(
+                    f"Flood limit on {type(method).__name__}, "
+                    f"retrying in {e.retry_after}s (attempt {attempt})"
+                )
+                (chat_bucket or self.global_bucket).pause(e.retry_after)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "retry_after": self.retry_after_count,
+            "global_waiting": self.global_bucket.waiting(),
+            "chat_buckets": len(self._chat_buckets),
+        }
+
+    def _chat_bucket(self, chat_id: int) -> TokenBucket:
+        bucket = self._chat_buckets.get(chat_id)
+        if bucket is None:
+            bucket = TokenBucket(self.chat_per_minute / 60, self.chat_per_minute)
+            self._chat_buckets[chat_id] = bucket
+            self._evict_idle_buckets()
+        else:
+            self._chat_buckets.move_to_end(chat_id)
+        return bucket
+
+    def _evict_idle_buckets(self):
+        for _ in range(len(self._chat_buckets) - self.max_chat_buckets):
+            chat_id, bucket = next(iter(self._chat_buckets.items()))
+            if bucket.is_idle():
+                del self._chat_buckets[chat_id]
+            else:
+                self._chat_buckets.move_to_end(chat_id)
@@ -0,0 +1,193 @@
+# SPDX-License-Identifier: MIT
+# Copyright (C) 2026 CodWiz
+
+import asyncio
+import heapq
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from aiogram import Bot
+
+from core.config import SETTINGS_FLUSH_INTERVAL, logger
+from core.metrics import registry
+from core.storage import PendingDeletionStore, pending_deletions
+from utils.batch_delete import BatchDeleter, batch_deleter
+
+
+class AutoDeleteScheduler:
+    """Единый планировщик автоудаления сообщений бота.
+
+    Сроки хранятся в словаре и min-heap, который разбирает одна фоновая
+    задача. Отмена меняет только словарь (O(1)). Перенос срока кладёт в
+    кучу новую запись (O(log n)), а старая остаётся в ней до извлечения
+    или перестройки кучи, когда устаревших записей становится больше
+    живых. Изменения накапливаются в буфере и периодически пакетно
+    сохраняются в журнал, чтобы пережить перезапуск.
+    """
+
+    def __init__(
+        self,
+        deleter: BatchDeleter,
+        store: Optional[PendingDeletionStore] = None,
+        flush_interval: float = SETTINGS_FLUSH_INTERVAL,
+    ):
+        self.deleter = deleter
+        self.store = store
+        self.flush_interval = flush_interval
+        self._deadlines: Dict[Tuple[int, int], float] = {}
+        self._heap: List[Tuple[float, int, int]] = []
+        self._added: Dict[Tuple[int, int], float] = {}
+        self._removed: Set[Tuple[int, int]] = set()
+        self._bot: Optional[Bot] = None
+        self._task: Optional[asyncio.Task] = None
+        self._flush_task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    async def start(self, bot: Bot):
+        """Восстанавливает сохранённые удаления и запускает планировщик"""
+        self._bot = bot
+        self._ensure_running()
+
+        if self.store is not None:
+            try:
+                rows = await asyncio.to_thread(self.store.load_all)
+            except Exception as e:
+                logger.error(f"Error loading pending deletions: {e}")
+                rows = []
+
+            now = time.time()
+            overdue = 0
+            for chat_id, message_id, due_at in rows:
+                if due_at <= now:
+                    self.deleter.enqueue(bot, chat_id, message_id)
+                    self._removed.add((chat_id, message_id))
+                    overdue += 1
+                else:
+                    self._push(chat_id, message_id, due_at)
+
+            if rows:
+                logger.info(
+                    f"Restored {len(rows) - overdue} pending deletions, "
+                    f"{overdue} overdue deleted"
+                )
+
+    def schedule(self, bot: Bot, chat_id: int, message_id: int, delay: float):
+        self._bot = bot
+        self._ensure_running()
+
+        due_at = time.time() + delay
+        self._push(chat_id, message_id, due_at)
+        if self.store is not None:
+            self._added[(chat_id, message_id)] = due_at
+            self._removed.discard((chat_id, message_id))
+
+    def reschedule(self, chat_id: int, message_id: int, delay: float) -> bool:
+        """Переносит срок: новая запись в куче, прежняя пропускается при извлечении"""
+        if (chat_id, message_id) not in self._deadlines or self._bot is None:
+            return False
+        self.schedule(self._bot, chat_id, message_id, delay)
+        return True
+
+    def cancel(self, chat_id: int, message_id: int) -> bool:
+        if self._deadlines.pop((chat_id, message_id), None) is None:
+            return False
+        self._forget(chat_id, message_id)
+        return True
+
+    def pending(self) -> int:
+        return len(self._deadlines)
+
+    async def flush(self):
+        if self.store is None or (not self._added and not self._removed):
+            return
+
+        added, self._added = self._added, {}
+        removed, self._removed = self._removed, set()
+        try:
+            await asyncio.to_thread(
+                self.store.apply,
+                [
+                    (chat_id, message_id, due)
+                    for (chat_id, message_id), due in added.items()
+                ],
+                list(removed),
+            )
+        except Exception as e:
+            logger.error(f"Error saving pending deletions: {e}")
+            self._added = {**added, **self._added}
+            self._removed |= removed - self._added.keys()
+
+    async def stop(self):
+        for task in (self._task, self._flush_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = None
+        self._flush_task = None
+        await self.flush()
+
+    def _push(self, chat_id: int, message_id: int, due_at: float):
+        self._deadlines[(chat_id, message_id)] = due_at
+        heapq.heappush(self._heap, (due_at, chat_id, message_id))
+        if self._heap[0][0] == due_at:
+            self._wakeup.set()
+
+    def _forget(self, chat_id: int, message_id: int):
+        if self.store is not None:
+            self._added.pop((chat_id, message_id), None)
+            self._removed.add((chat_id, message_id))
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+        if self.store is not None and self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    def _pop_due(self, now: float) -> List[Tuple[int, int]]:
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            deadline, chat_id, message_id = heapq.heappop(self._heap)
+            key = (chat_id, message_id)
+            if self._deadlines.get(key) == deadline:
+                del self._deadlines[key]
+                self._forget(chat_id, message_id)
+                due.append(key)
+
+        if len(self._heap) > 2 * len(self._deadlines) + 64:
+            self._heap = [
+                (deadline, chat_id, message_id)
+                for (chat_id, message_id), deadline in self._deadlines.items()
+            ]
+            heapq.heapify(self._heap)
+
+        return due
+
+    async def _run(self):
+        while True:
+            for chat_id, message_id in self._pop_due(time.time()):
+                self.deleter.enqueue(self._bot, chat_id, message_id)
+
+            timeout = self._heap[0][0] - time.time() if self._heap else None
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _flush_loop(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+
+auto_delete_scheduler = AutoDeleteScheduler(batch_deleter, pending_deletions)
+
+registry.gauge_callback(
+    "cleaner_auto_delete_pending",
+    "Bot messages waiting for scheduled auto-deletion",
+    lambda: {(): auto_delete_scheduler.pending()},
+)